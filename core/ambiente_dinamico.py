@@ -0,0 +1,147 @@
+# core/ambiente_dinamico.py
+import random
+from bisect import bisect_left
+
+from core.ponto_voo import LIMITES_POLUICAO
+
+try:
+    import numpy as np
+except ImportError: # NumPy é opcional: sem ele o estêncil roda em Python puro
+    np = None
+
+# Direção de onde o vento sopra -> deslocamento (dx, dy) da poluição no grid
+DESLOCAMENTO_VENTO = {
+    "N": (0, 1), "NE": (-1, 1), "E": (-1, 0), "SE": (-1, -1),
+    "S": (0, -1), "SO": (1, -1), "O": (1, 0), "NO": (1, 1),
+}
+ROSA_DOS_VENTOS = list(DESLOCAMENTO_VENTO)
+
+DIFUSAO_PADRAO = 0.15 # Fração trocada com os 4 vizinhos por tick (estável até 0.25)
+ADVECCAO_PADRAO = 0.2 # Fração transportada pelo vento por tick (estável até 1.0)
+RELAXAMENTO_PADRAO = 0.05 # Retorno à emissão base de cada célula por tick
+PROBABILIDADE_GIRO_VENTO = 0.1 # Chance de o vento girar 45° a cada tick
+
+
+class AmbienteDinamico:
+    """
+    Evolui o AQI de um MapaAmbiental no tempo: difusão (laplaciano de 5 pontos),
+    deriva com o vento (upwind) e relaxamento à emissão base de cada célula.
+
+    Cada tick é uma operação sobre o grid inteiro (NumPy quando disponível),
+    inclusive o arredondamento e a categorização: as camadas mapa.poluicao
+    (o que mapa.amostrar() entrega ao PontoDeVoo) e mapa.categorias são
+    trocadas de uma vez. Só as células cuja categoria mudou passam por Python:
+    passo() as devolve para o desenho atualizar só esses itens.
+    """
+    def __init__(self, mapa, difusao=DIFUSAO_PADRAO, adveccao=ADVECCAO_PADRAO,
+                 relaxamento=RELAXAMENTO_PADRAO, direcao_vento="N", seed=None):
+        self.mapa = mapa
+        self.difusao = difusao
+        self.adveccao = adveccao
+        self.relaxamento = relaxamento
+        self.direcao_vento = direcao_vento
+        self.tempo = 0 # Ticks simulados
+        self._rng = random.Random(seed)
+
+        if np is not None:
+            self._base = np.array(mapa.poluicao_base, dtype=float).reshape(mapa.altura, mapa.largura)
+        else:
+            self._base = [float(v) for v in mapa.poluicao_base]
+        self._definir_grade(mapa.poluicao)
+
+    def _definir_grade(self, valores):
+        """Grade contínua de AQI (plana, r * largura + c), partindo do AQI inteiro atual do mapa."""
+        if np is not None:
+            self._grade = np.array(valores, dtype=float).reshape(self.mapa.altura, self.mapa.largura)
+        else:
+            self._grade = [float(v) for v in valores]
+
+    def estado(self) -> dict:
+        """Estado completo da evolução (para snapshot): grade contínua, vento, tempo e gerador aleatório."""
+        grade = self._grade.ravel().tolist() if np is not None else list(self._grade)
+        return {
+            "grade": grade,
+            "direcao_vento": self.direcao_vento,
+            "tempo": self.tempo,
+            "rng": self._rng.getstate(),
+        }
+
+    def restaurar_estado(self, estado: dict):
+        """Retoma a evolução exatamente de onde o estado() foi tirado."""
+        self._definir_grade(estado["grade"])
+        if np is not None:
+            self.mapa.definir_poluicao(np.rint(self._grade))
+        else:
+            self.mapa.definir_poluicao([round(v) for v in self._grade])
+        self.direcao_vento = estado["direcao_vento"]
+        self.tempo = estado["tempo"]
+        self._rng.setstate(estado["rng"])
+
+    def _girar_vento(self):
+        if self._rng.random() < PROBABILIDADE_GIRO_VENTO:
+            i = ROSA_DOS_VENTOS.index(self.direcao_vento)
+            self.direcao_vento = ROSA_DOS_VENTOS[(i + self._rng.choice((-1, 1))) % len(ROSA_DOS_VENTOS)]
+
+    def passo(self) -> list:
+        """Avança um tick e retorna as células (c, r) cuja categoria de AQI mudou."""
+        self.tempo += 1
+        self._girar_vento()
+        if np is not None:
+            return self._passo_numpy()
+        return self._passo_python()
+
+    def _passo_numpy(self) -> list:
+        grade = self._grade
+        altura, largura = grade.shape
+        dx, dy = DESLOCAMENTO_VENTO[self.direcao_vento]
+        borda = np.pad(grade, 1, mode="edge") # Bordas sem fluxo (Neumann)
+
+        laplaciano = (borda[:-2, 1:-1] + borda[2:, 1:-1] + borda[1:-1, :-2] + borda[1:-1, 2:]) - 4 * grade
+        # A poluição vem da célula a barlavento: (c - dx, r - dy)
+        barlavento = borda[1 - dy:1 - dy + altura, 1 - dx:1 - dx + largura]
+        grade = (grade + self.difusao * laplaciano - self.adveccao * (grade - barlavento)
+                 + self.relaxamento * (self._base - grade))
+        np.maximum(grade, 0, out=grade)
+        self._grade = grade
+
+        poluicao = np.rint(grade).astype(np.int64).ravel()
+        categorias = np.searchsorted(LIMITES_POLUICAO, poluicao, side="left")
+        mudaram = np.flatnonzero(categorias != self.mapa.categorias)
+        self.mapa.poluicao = poluicao
+        self.mapa.categorias = categorias
+        linhas, colunas = np.divmod(mudaram, largura)
+        return list(zip(colunas.tolist(), linhas.tolist()))
+
+    def _passo_python(self) -> list:
+        grade = self._grade
+        largura, altura = self.mapa.largura, self.mapa.altura
+        dx, dy = DESLOCAMENTO_VENTO[self.direcao_vento]
+        nova = [0.0] * len(grade)
+
+        def valor(c, r):
+            c = min(max(c, 0), largura - 1)
+            r = min(max(r, 0), altura - 1)
+            return grade[r * largura + c]
+
+        for r in range(altura):
+            for c in range(largura):
+                i = r * largura + c
+                atual = grade[i]
+                laplaciano = valor(c, r - 1) + valor(c, r + 1) + valor(c - 1, r) + valor(c + 1, r) - 4 * atual
+                barlavento = valor(c - dx, r - dy)
+                novo = (atual + self.difusao * laplaciano - self.adveccao * (atual - barlavento)
+                        + self.relaxamento * (self._base[i] - atual))
+                nova[i] = max(novo, 0.0)
+        self._grade = nova
+
+        poluicao, categorias = self.mapa.poluicao, self.mapa.categorias
+        mudaram = []
+        for i, v in enumerate(nova):
+            inteiro = int(round(v))
+            if inteiro != poluicao[i]:
+                poluicao[i] = inteiro
+                categoria = bisect_left(LIMITES_POLUICAO, inteiro)
+                if categoria != categorias[i]:
+                    categorias[i] = categoria
+                    mudaram.append((i % largura, i // largura))
+        return mudaram
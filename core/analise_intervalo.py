@@ -0,0 +1,197 @@
+# core/analise_intervalo.py
+import math
+from array import array
+from functools import reduce
+from operator import add
+
+# Valores por bloco nas colunas da forma fria (ColunaEmBlocos)
+TAMANHO_BLOCO = 64
+
+
+class SomasPrefixadas:
+    """Somas acumuladas: soma de qualquer intervalo [i, j] em O(1), inserção em O(1)."""
+    def __init__(self):
+        self._acumulado = [0.0]
+
+    def adicionar(self, valor: float):
+        self._acumulado.append(self._acumulado[-1] + valor)
+
+    def __len__(self):
+        return len(self._acumulado) - 1
+
+    def soma(self, i: int, j: int) -> float:
+        """Soma dos valores de índice i até j (inclusive)."""
+        return self._acumulado[j + 1] - self._acumulado[i]
+
+
+class ArvoreSegmentosMinMax:
+    """
+    Árvore de segmentos (iterativa, base potência de 2) com mínimo e máximo.
+    Inserção no final em O(log n) amortizado; consulta de intervalo em O(log n).
+    """
+    def __init__(self):
+        self._n = 0
+        self._capacidade = 1
+        self._min = [math.inf] * 2
+        self._max = [-math.inf] * 2
+
+    def __len__(self):
+        return self._n
+
+    def adicionar(self, valor: float):
+        if self._n == self._capacidade:
+            self._crescer()
+        i = self._capacidade + self._n
+        self._min[i] = valor
+        self._max[i] = valor
+        self._n += 1
+        # Só há inserção no final: cada ancestral muda apenas se o novo valor
+        # superar o extremo atual, e a subida para assim que nenhum dos dois muda
+        i //= 2
+        while i:
+            alterou = False
+            if valor < self._min[i]:
+                self._min[i] = valor
+                alterou = True
+            if valor > self._max[i]:
+                self._max[i] = valor
+                alterou = True
+            if not alterou:
+                break
+            i //= 2
+
+    def _crescer(self):
+        """
+        Dobra a capacidade: a árvore atual vira a subárvore esquerda da nova
+        raiz (a direita ainda está vazia). Cada nível é copiado com uma única
+        atribuição de fatia, sem recalcular nó a nó.
+        """
+        cap = self._capacidade
+        self._min = self._dobrar(self._min, cap, math.inf)
+        self._max = self._dobrar(self._max, cap, -math.inf)
+        self._capacidade = 2 * cap
+
+    @staticmethod
+    def _dobrar(extremos: list, cap: int, neutro: float) -> list:
+        novos = [neutro] * (4 * cap)
+        inicio = 1
+        while inicio <= cap:
+            # Nível [inicio, 2 * inicio) vai para a metade esquerda do nível de baixo
+            novos[2 * inicio:3 * inicio] = extremos[inicio:2 * inicio]
+            inicio *= 2
+        novos[1] = extremos[1] # Raiz nova: subárvore direita vazia
+        return novos
+
+    def consultar(self, i: int, j: int) -> tuple:
+        """Retorna (mínimo, máximo) dos valores de índice i até j (inclusive)."""
+        menor, maior = math.inf, -math.inf
+        esquerda = i + self._capacidade
+        direita = j + self._capacidade + 1
+        while esquerda < direita:
+            if esquerda & 1:
+                menor = min(menor, self._min[esquerda])
+                maior = max(maior, self._max[esquerda])
+                esquerda += 1
+            if direita & 1:
+                direita -= 1
+                menor = min(menor, self._min[direita])
+                maior = max(maior, self._max[direita])
+            esquerda //= 2
+            direita //= 2
+        return menor, maior
+
+
+class ColunaEmBlocos:
+    """
+    Coluna imutável para as consultas de intervalo da forma fria: os códigos
+    (array de inteiros no menor tipo possível) e, a cada TAMANHO_BLOCO
+    valores, a soma acumulada e o mínimo/máximo do bloco. soma() e consultar()
+    têm a interface de SomasPrefixadas e ArvoreSegmentosMinMax, mas percorrem
+    só os blocos das pontas; os blocos inteiros do meio vêm dos agregados.
+
+    'decodificar' (função crescente) converte cada código no valor, ex.:
+    math.sqrt do quadrado do passo; as somas seguem a mesma ordem da
+    SomasPrefixadas e dão o mesmo resultado. Sem ela, os códigos são os
+    próprios valores e as somas são inteiras (exatas).
+    """
+    def __init__(self, codigos: array, acumulados: array, minimos: array, maximos: array, decodificar=None):
+        self._codigos = codigos
+        self._acumulados = acumulados # Soma dos códigos antes de cada bloco (+ total no fim)
+        self._minimos = minimos
+        self._maximos = maximos
+        self._decodificar = decodificar
+
+    @classmethod
+    def de_codigos(cls, codigos: array, decodificar=None):
+        """Calcula os agregados por bloco (O(n), uma passada)."""
+        acumulados = [0 if decodificar is None else 0.0]
+        minimos, maximos = [], []
+        for inicio in range(0, len(codigos), TAMANHO_BLOCO):
+            bloco = codigos[inicio:inicio + TAMANHO_BLOCO]
+            acumulados.append(_somar(bloco, acumulados[-1], decodificar))
+            minimos.append(min(bloco))
+            maximos.append(max(bloco))
+        tipo_soma = "q" if decodificar is None else "d"
+        return cls(codigos, array(tipo_soma, acumulados), array(codigos.typecode, minimos),
+                   array(codigos.typecode, maximos), decodificar)
+
+    def partes(self) -> dict:
+        """Arrays que compõem a coluna (para gravar sem recalcular)."""
+        return {"codigos": self._codigos, "acumulados": self._acumulados,
+                "minimos": self._minimos, "maximos": self._maximos}
+
+    def __len__(self):
+        return len(self._codigos)
+
+    def _acumulado_ate(self, k: int):
+        """Soma dos valores de índice 0 até k - 1."""
+        bloco = k // TAMANHO_BLOCO
+        return _somar(self._codigos[bloco * TAMANHO_BLOCO:k], self._acumulados[bloco], self._decodificar)
+
+    def soma(self, i: int, j: int):
+        """Soma dos valores de índice i até j (inclusive)."""
+        return self._acumulado_ate(j + 1) - self._acumulado_ate(i)
+
+    def consultar(self, i: int, j: int) -> tuple:
+        """Retorna (mínimo, máximo) dos valores de índice i até j (inclusive)."""
+        codigos = self._codigos
+        bloco_i, bloco_j = i // TAMANHO_BLOCO, j // TAMANHO_BLOCO
+        if bloco_i == bloco_j:
+            trecho = codigos[i:j + 1]
+            menor, maior = min(trecho), max(trecho)
+        else:
+            esquerda = codigos[i:(bloco_i + 1) * TAMANHO_BLOCO]
+            direita = codigos[bloco_j * TAMANHO_BLOCO:j + 1]
+            menor = min(min(esquerda), min(direita))
+            maior = max(max(esquerda), max(direita))
+            if bloco_j - bloco_i > 1:
+                menor = min(menor, min(self._minimos[bloco_i + 1:bloco_j]))
+                maior = max(maior, max(self._maximos[bloco_i + 1:bloco_j]))
+        if self._decodificar is not None:
+            return self._decodificar(menor), self._decodificar(maior)
+        return menor, maior
+
+
+def _somar(codigos, inicial, decodificar):
+    if decodificar is None:
+        return inicial + sum(codigos)
+    # Soma sequencial (não sum(), que compensa o arredondamento): mesma ordem da SomasPrefixadas
+    return reduce(add, map(decodificar, codigos), inicial)
+
+
+class InstantesEmMs:
+    """
+    Instantes de uma missão (segundos desde o início) guardados como
+    milissegundos inteiros. Sequência indexável: serve direto para bisect.
+    """
+    def __init__(self, milissegundos: array):
+        self._milissegundos = milissegundos
+
+    def partes(self) -> dict:
+        return {"milissegundos": self._milissegundos}
+
+    def __len__(self):
+        return len(self._milissegundos)
+
+    def __getitem__(self, k: int) -> float:
+        return self._milissegundos[k] / 1000
@@ -0,0 +1,216 @@
+# core/arquivo_missao.py
+import lzma
+import math
+import pickle
+import zlib
+from array import array
+from collections import OrderedDict
+from itertools import accumulate
+
+from core.analise_intervalo import ColunaEmBlocos, InstantesEmMs, TAMANHO_BLOCO
+from core.colunar import codificar_pontos, decodificar_pontos
+
+# Compressões aceitas para missões arquivadas (1º byte do arquivo identifica o método)
+COMPRESSOES = {None: 0, "zlib": 1, "lzma": 2}
+COMPRESSAO_PADRAO = "zlib"
+
+QUANTIZACAO_BATERIA = 100 # Bateria guardada em centésimos de % (uint16)
+CAMPOS_DELTA = ("x", "y") # Coordenadas mudam de ±1 por passo: deltas cabem em 1 byte
+CAPACIDADE_AREA_QUENTE = 4 # Missões arquivadas que podem ficar reidratadas ao mesmo tempo
+
+# Typecodes inteiros do menor para o maior
+_TIPOS_INTEIROS = [("b", -2**7, 2**7 - 1), ("B", 0, 2**8 - 1), ("h", -2**15, 2**15 - 1),
+                   ("H", 0, 2**16 - 1), ("i", -2**31, 2**31 - 1), ("q", -2**63, 2**63 - 1)]
+
+
+def _array_inteiros(valores) -> array:
+    """Array no menor tipo inteiro que comporta os valores."""
+    valores = list(valores)
+    menor = min(valores, default=0)
+    maior = max(valores, default=0)
+    for tipo, minimo, maximo in _TIPOS_INTEIROS:
+        if minimo <= menor and maior <= maximo:
+            return array(tipo, valores)
+    raise OverflowError("Valor inteiro fora do intervalo de 64 bits.")
+
+
+def _inteiros_compactos(valores) -> tuple:
+    """Retorna (typecode, bytes) usando o menor tipo inteiro que comporta os valores."""
+    valores = _array_inteiros(valores)
+    return valores.typecode, valores.tobytes()
+
+
+def _ler_inteiros(tipo: str, dados: bytes) -> array:
+    valores = array(tipo)
+    valores.frombytes(dados)
+    return valores
+
+
+def _deltas(valores) -> list:
+    anterior = 0
+    resultado = []
+    for v in valores:
+        resultado.append(v - anterior)
+        anterior = v
+    return resultado
+
+
+def compactar_pontos(pontos: list, compressao=COMPRESSAO_PADRAO) -> bytes:
+    """
+    Representação fria de uma lista de PontoDeVoo: coordenadas em delta,
+    bateria quantizada (0,01%), instantes em deltas de milissegundos,
+    categorias como códigos e inteiros no menor tipo possível.
+    """
+    return compactar_colunas(codificar_pontos(pontos), compressao)
+
+
+def compactar_colunas(colunas: dict, compressao=COMPRESSAO_PADRAO) -> bytes:
+    """compactar_pontos para colunas já codificadas (formato de codificar_pontos)."""
+    if compressao not in COMPRESSOES:
+        raise ValueError(f"Compressão desconhecida: {compressao!r}")
+
+    numericos = colunas["numericos"]
+    inteiros = {}
+    for campo, valores in numericos.items():
+        if campo in ("nivel_bateria", "instante"):
+            continue
+        if campo in CAMPOS_DELTA:
+            inteiros[campo] = (True,) + _inteiros_compactos(_deltas(valores))
+        else:
+            inteiros[campo] = (False,) + _inteiros_compactos(valores)
+
+    instantes = numericos["instante"]
+    instante_inicial = instantes[0] if instantes else 0.0
+    milissegundos = [round((t - instante_inicial) * 1000) for t in instantes]
+
+    carga = {
+        "n": colunas["n"],
+        "inteiros": inteiros,
+        "bateria": _inteiros_compactos(round(b * QUANTIZACAO_BATERIA) for b in numericos["nivel_bateria"]),
+        "instante_inicial": instante_inicial,
+        "instantes_ms": _inteiros_compactos(_deltas(milissegundos)),
+        "categoricos": {campo: (vocab, codigos.tobytes()) for campo, (vocab, codigos) in colunas["categoricos"].items()},
+    }
+    bruto = pickle.dumps(carga, protocol=5)
+    if compressao == "zlib":
+        bruto = zlib.compress(bruto, 6)
+    elif compressao == "lzma":
+        bruto = lzma.compress(bruto)
+    return bytes([COMPRESSOES[compressao]]) + bruto
+
+
+def descompactar_pontos(arquivo: bytes) -> list:
+    """Reconstrói a lista de PontoDeVoo a partir de compactar_pontos."""
+    return decodificar_pontos(descompactar_colunas(arquivo))
+
+
+def descompactar_colunas(arquivo: bytes) -> dict:
+    """
+    Colunas (formato de codificar_pontos) a partir de compactar_pontos, sem
+    criar nenhum PontoDeVoo: basta para reconstruir índices de uma missão.
+    """
+    metodo, bruto = arquivo[0], arquivo[1:]
+    if metodo == COMPRESSOES["zlib"]:
+        bruto = zlib.decompress(bruto)
+    elif metodo == COMPRESSOES["lzma"]:
+        bruto = lzma.decompress(bruto)
+    carga = pickle.loads(bruto)
+
+    numericos = {}
+    for campo, (delta, tipo, dados) in carga["inteiros"].items():
+        valores = _ler_inteiros(tipo, dados)
+        numericos[campo] = array("i", accumulate(valores)) if delta else valores
+    numericos["nivel_bateria"] = array("d", (b / QUANTIZACAO_BATERIA for b in _ler_inteiros(*carga["bateria"])))
+    inicial = carga["instante_inicial"]
+    numericos["instante"] = array("d", (inicial + ms / 1000 for ms in accumulate(_ler_inteiros(*carga["instantes_ms"]))))
+
+    return {
+        "n": carga["n"],
+        "numericos": numericos,
+        "categoricos": {campo: (vocab, _ler_inteiros("B", codigos)) for campo, (vocab, codigos) in carga["categoricos"].items()},
+    }
+
+
+def _centesimos(codigo: int) -> float:
+    return codigo / QUANTIZACAO_BATERIA
+
+
+# Como cada índice frio converte seus códigos em valores (ver indices_frios)
+DECODIFICADORES_INDICES = {
+    "distancia": math.sqrt,
+    "consumo": _centesimos,
+    "poluicao": None,
+    "densidade": None,
+}
+
+
+def indices_frios(colunas: dict, instante_inicio: float) -> dict:
+    """
+    Índices de intervalo da forma fria, direto das colunas (sem PontoDeVoo),
+    em ColunaEmBlocos de inteiros: quadrado de cada passo (a distância é a
+    raiz, igual a calcular_distancia), bateria gasta por passo em centésimos
+    de % (a mesma quantização do arquivo), AQI e densidade. Os instantes ficam
+    em milissegundos desde 'instante_inicio' (início da missão).
+    """
+    numericos = colunas["numericos"]
+    x, y = numericos["x"], numericos["y"]
+    bateria = [round(b * QUANTIZACAO_BATERIA) for b in numericos["nivel_bateria"]]
+    primeiro = [0] * min(1, colunas["n"]) # O primeiro ponto não tem trecho anterior
+    codigos = {
+        "distancia": primeiro + [(x2 - x1) ** 2 + (y2 - y1) ** 2 for x1, y1, x2, y2 in zip(x, y, x[1:], y[1:])],
+        "consumo": primeiro + [anterior - atual for anterior, atual in zip(bateria, bateria[1:])],
+        "poluicao": numericos["indice_poluicao_ar"],
+        "densidade": numericos["densidade_populacional"],
+    }
+    indices = {campo: ColunaEmBlocos.de_codigos(_array_inteiros(valores), DECODIFICADORES_INDICES[campo])
+               for campo, valores in codigos.items()}
+    indices["instantes"] = InstantesEmMs(_array_inteiros(round((t - instante_inicio) * 1000) for t in numericos["instante"]))
+    return indices
+
+
+def partes_indices(indices: dict) -> dict:
+    """Arrays de cada índice frio (ex.: para o snapshot gravar sem o blob)."""
+    return {campo: indice.partes() for campo, indice in indices.items()}
+
+
+def indices_de_partes(partes: dict) -> dict:
+    """
+    Inverso de partes_indices: remonta os índices frios sem descompactar o
+    arquivo. Confere os tamanhos dos arrays (ValueError se não baterem).
+    """
+    n = len(partes["instantes"]["milissegundos"])
+    blocos = math.ceil(n / TAMANHO_BLOCO)
+    indices = {"instantes": InstantesEmMs(**partes["instantes"])}
+    for campo, decodificar in DECODIFICADORES_INDICES.items():
+        arrays = partes[campo]
+        if (len(arrays["codigos"]) != n or len(arrays["acumulados"]) != blocos + 1
+                or len(arrays["minimos"]) != blocos or len(arrays["maximos"]) != blocos):
+            raise ValueError(f"Índice frio '{campo}' inconsistente.")
+        indices[campo] = ColunaEmBlocos(**arrays, decodificar=decodificar)
+    return indices
+
+
+class AreaQuente:
+    """
+    Limita quantas missões arquivadas ficam reidratadas (pontos em memória).
+    Ao passar da capacidade, a menos usada recentemente volta à forma fria.
+    """
+    def __init__(self, capacidade: int = CAPACIDADE_AREA_QUENTE):
+        self.capacidade = capacidade
+        self._missoes = OrderedDict()
+
+    def registrar(self, missao):
+        self._missoes[id(missao)] = missao
+        self._missoes.move_to_end(id(missao))
+        while len(self._missoes) > self.capacidade:
+            _, antiga = self._missoes.popitem(last=False)
+            antiga.rebaixar()
+
+    def descartar(self, missao):
+        self._missoes.pop(id(missao), None)
+
+    def __len__(self):
+        return len(self._missoes)
+
+
+AREA_QUENTE = AreaQuente()
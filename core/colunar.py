@@ -0,0 +1,104 @@
+# core/colunar.py
+from array import array
+
+from core.ponto_voo import PontoDeVoo
+
+# Atributos numéricos do PontoDeVoo e o typecode do array que os armazena
+CAMPOS_NUMERICOS = [
+    ("x", "i"),
+    ("y", "i"),
+    ("nivel_bateria", "d"),
+    ("instante", "d"),
+    ("altitude", "i"),
+    ("velocidade", "i"),
+    ("temperatura_ambiente", "i"),
+    ("num_fotos_registradas", "i"),
+    ("densidade_populacional", "i"),
+    ("presenca_areas_verdes", "i"),
+    ("indice_poluicao_ar", "i"),
+    ("intensidade_ruido", "i"),
+]
+
+# Atributos com poucos valores distintos: guardados como códigos + vocabulário
+CAMPOS_CATEGORICOS = [
+    "direcao_vento",
+    "status_carga",
+    "status_camera",
+    "tipo_area",
+    "presenca_construcoes_altas",
+    "sinal_gps",
+]
+
+
+def codificar_pontos(pontos: list) -> dict:
+    """
+    Converte uma sequência de PontoDeVoo em colunas (array.array por atributo).
+    Formato: {"n": int, "numericos": {campo: array}, "categoricos": {campo: (vocabulario, array de códigos)}}
+    """
+    numericos = {campo: array(tipo) for campo, tipo in CAMPOS_NUMERICOS}
+    categoricos = {campo: ([], {}, array("B")) for campo in CAMPOS_CATEGORICOS}
+
+    for ponto in pontos:
+        x, y = ponto.coordenadas
+        numericos["x"].append(x)
+        numericos["y"].append(y)
+        for campo, _ in CAMPOS_NUMERICOS[2:]:
+            numericos[campo].append(getattr(ponto, campo))
+        for campo in CAMPOS_CATEGORICOS:
+            vocabulario, indice, codigos = categoricos[campo]
+            valor = getattr(ponto, campo)
+            codigo = indice.get(valor)
+            if codigo is None:
+                codigo = len(vocabulario)
+                vocabulario.append(valor)
+                indice[valor] = codigo
+            codigos.append(codigo)
+
+    return {
+        "n": len(numericos["x"]),
+        "numericos": numericos,
+        "categoricos": {campo: (vocab, codigos) for campo, (vocab, _, codigos) in categoricos.items()},
+    }
+
+
+def decodificar_pontos(colunas: dict) -> list:
+    """
+    Reconstrói a lista de PontoDeVoo a partir das colunas. Cada coluna pode ser
+    um array.array ou qualquer buffer (ex.: memoryview sobre um mmap), lido
+    com memoryview.cast; os pontos são sempre materializados (nenhuma visão
+    sobre o buffer sobrevive ao retorno).
+    """
+    n = colunas["n"]
+    # Colunas ausentes (arquivos de versões anteriores) são simplesmente ignoradas
+    numericos = {
+        campo: _como_sequencia(colunas["numericos"][campo], tipo)
+        for campo, tipo in CAMPOS_NUMERICOS
+        if campo in colunas["numericos"]
+    }
+    categoricos = {
+        campo: (vocab, _como_sequencia(codigos, "B"))
+        for campo, (vocab, codigos) in colunas["categoricos"].items()
+    }
+
+    pontos = []
+    try:
+        for i in range(n):
+            campos = {"coordenadas": (numericos["x"][i], numericos["y"][i])}
+            for campo, coluna in numericos.items():
+                campos[campo] = coluna[i]
+            del campos["x"], campos["y"]
+            for campo, (vocab, codigos) in categoricos.items():
+                campos[campo] = vocab[codigos[i]]
+            pontos.append(PontoDeVoo.restaurar(campos))
+    finally:
+        # Libera o buffer subjacente (necessário para fechar o mmap), inclusive em erro
+        for visao in list(numericos.values()) + [c for _, c in categoricos.values()]:
+            if isinstance(visao, memoryview):
+                visao.release()
+    return pontos
+
+
+def _como_sequencia(buffer, tipo):
+    if isinstance(buffer, array):
+        return buffer
+    return memoryview(buffer).cast("B").cast(tipo)
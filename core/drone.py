@@ -1,8 +1,13 @@
 # core/drone.py
 from core.lista_encadeada import ListaEncadeada
 from core.missao import Missao
+from core.registro_missoes import REGISTRO_MISSOES
 import random 
 
+# Faixa de consumo de bateria (%) por ponto de voo registrado
+CONSUMO_MINIMO = 0.5
+CONSUMO_MAXIMO = 2.0
+
 class Drone:
     """Representa a entidade Drone e seu histórico de missões."""
     def __init__(self, identificador: str, modelo: str):
@@ -10,10 +15,13 @@ class Drone:
         self.modelo = modelo
         self.imagem_path = "drone.png"
         # LISTA ENCADEDA PRINCIPAL: Armazena o histórico de Missões
-        self.missoes = ListaEncadeada() 
+        self.missoes = ListaEncadeada(indexar_por_id=True) 
         self.missao_ativa = None
         self.bateria = 100 # Nível inicial da bateria (0-100%)
         self.initial_battery = 100 # Para resetar após a missão
+        # Posição própria no mapa compartilhado pela frota
+        self.x = 0
+        self.y = 0
 
     def iniciar_missao(self, tipo_missao: str):
         if self.missao_ativa is not None:
@@ -22,14 +30,30 @@ class Drone:
         self.bateria = self.initial_battery # Reseta a bateria para nova missão
         nova = Missao(tipo_missao)
         self.missao_ativa = nova
+        REGISTRO_MISSOES.registrar(nova, self.identificador)
         return f"🚀 Missão '{tipo_missao}' iniciada com sucesso."
 
+    def cancelar_missao(self):
+        """Descarta a missão em andamento sem guardá-la no histórico."""
+        if self.missao_ativa is not None:
+            REGISTRO_MISSOES.remover(self.missao_ativa)
+            self.missao_ativa = None
+
+    def remover_missao(self, missao) -> bool:
+        """Remove uma missão finalizada do histórico e do registro da frota."""
+        if not self.missoes.remover(missao):
+            return False
+        REGISTRO_MISSOES.remover(missao)
+        return True
+
     def registrar_ponto_voo(self, x: int, y: int, environmental_data):
         if not self.missao_ativa:
             return "❌ Nenhuma missão ativa para registrar ponto."
+
+        self.x, self.y = x, y
         
         # Simula consumo de bateria
-        consumo = random.uniform(0.5, 2.0)
+        consumo = random.uniform(CONSUMO_MINIMO, CONSUMO_MAXIMO)
         self.bateria = max(0, self.bateria - consumo)
 
         # Chama a inserção do nó de ponto de voo na sub-lista
@@ -42,6 +66,7 @@ class Drone:
 
         self.missao_ativa.finalizar_missao()
         # Insere a missão concluída na Lista Encadeada Principal
+        # (a interface a rebaixa para a forma fria em segundo plano: GeradorRelatoriosAssincrono.arquivar)
         self.missoes.inserir_final(self.missao_ativa)
         missao_finalizada_tipo = self.missao_ativa.tipo
         self.missao_ativa = None
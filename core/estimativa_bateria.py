@@ -0,0 +1,109 @@
+# core/estimativa_bateria.py
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError: # NumPy é opcional: sem ele usa-se o laço em Python puro
+    np = None
+
+from core.drone import CONSUMO_MINIMO, CONSUMO_MAXIMO
+
+AMOSTRAS_PADRAO = 2000
+AMOSTRAS_SEM_NUMPY = 500 # Mantém o laço em Python puro dentro do orçamento de um quadro
+PERCENTIS = (5, 50, 95)
+CONFIANCA_RETORNO = 0.95 # Fração mínima das simulações que precisa alcançar a base
+DISTANCIA_POR_PASSO = 1.0 # Cada movimento avança uma célula (mesma unidade do relatório)
+
+
+def passos_necessarios(origem: tuple, rota=None, base=None) -> int:
+    """
+    Conta os movimentos (1 célula cada, sem diagonais) para percorrer a rota
+    planejada a partir da origem e, se informada, voltar à base.
+    """
+    passos = 0
+    atual = origem
+    for destino in (rota or []):
+        passos += abs(destino[0] - atual[0]) + abs(destino[1] - atual[1])
+        atual = destino
+    if base is not None:
+        passos += abs(base[0] - atual[0]) + abs(base[1] - atual[1])
+    return passos
+
+
+def _simular_numpy(bateria, n_amostras, rng_seed):
+    rng = np.random.default_rng(rng_seed)
+    # Nenhuma simulação passa de bateria/CONSUMO_MINIMO movimentos
+    max_passos = int(math.ceil(bateria / CONSUMO_MINIMO)) + 1
+    consumos = rng.uniform(CONSUMO_MINIMO, CONSUMO_MAXIMO, size=(n_amostras, max_passos))
+    acumulado = np.cumsum(consumos, axis=1)
+    # O drone só se move com bateria > 0: o último passo é o que zera a carga
+    return (acumulado < bateria).sum(axis=1) + 1
+
+
+def _simular_python(bateria, n_amostras, rng_seed):
+    rng = random.Random(rng_seed)
+    uniforme = rng.uniform
+    passos = []
+    for _ in range(n_amostras):
+        restante = bateria
+        contador = 0
+        while restante > 0:
+            restante -= uniforme(CONSUMO_MINIMO, CONSUMO_MAXIMO)
+            contador += 1
+        passos.append(contador)
+    return passos
+
+
+def _percentil(ordenados: list, p: float) -> float:
+    """Percentil com interpolação linear (mesma convenção do numpy.percentile)."""
+    if len(ordenados) == 1:
+        return float(ordenados[0])
+    pos = (len(ordenados) - 1) * p / 100
+    i = int(pos)
+    frac = pos - i
+    if i + 1 >= len(ordenados):
+        return float(ordenados[-1])
+    return ordenados[i] + (ordenados[i + 1] - ordenados[i]) * frac
+
+
+def estimar_autonomia(bateria: float, posicao: tuple, rota=None, base=None, n_amostras=None, seed=None):
+    """
+    Estima por Monte Carlo quantos movimentos restam ao drone, repetindo o
+    modelo de consumo de Drone.registrar_ponto_voo a partir da bateria atual.
+
+    Retorna percentis de passos e distância restantes (cada movimento percorre
+    uma célula) e se a rota planejada + retorno à base é viável em pelo menos
+    CONFIANCA_RETORNO das simulações.
+    """
+    necessarios = passos_necessarios(posicao, rota, base)
+    if bateria <= 0:
+        zeros = {p: 0.0 for p in PERCENTIS}
+        return {
+            "passos": zeros,
+            "distancia": dict(zeros),
+            "passos_necessarios": necessarios,
+            "probabilidade_retorno": 1.0 if necessarios == 0 else 0.0,
+            "retorno_viavel": necessarios == 0,
+            "amostras": 0,
+        }
+
+    if np is not None:
+        n = n_amostras or AMOSTRAS_PADRAO
+        passos = np.sort(_simular_numpy(bateria, n, seed))
+        percentis_passos = {p: float(v) for p, v in zip(PERCENTIS, np.percentile(passos, PERCENTIS))}
+        probabilidade = float((passos >= necessarios).mean())
+    else:
+        n = n_amostras or AMOSTRAS_SEM_NUMPY
+        passos = sorted(_simular_python(bateria, n, seed))
+        percentis_passos = {p: _percentil(passos, p) for p in PERCENTIS}
+        probabilidade = sum(1 for v in passos if v >= necessarios) / n
+
+    return {
+        "passos": percentis_passos,
+        "distancia": {p: v * DISTANCIA_POR_PASSO for p, v in percentis_passos.items()},
+        "passos_necessarios": necessarios,
+        "probabilidade_retorno": probabilidade,
+        "retorno_viavel": probabilidade >= CONFIANCA_RETORNO,
+        "amostras": n,
+    }
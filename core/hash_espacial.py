@@ -0,0 +1,98 @@
+# core/hash_espacial.py
+import math
+
+TAMANHO_BALDE_PADRAO = 4 # Lado do balde, em células do mapa
+
+
+class HashEspacial:
+    """
+    Hash espacial uniforme: cada objeto fica no balde (x // tamanho, y // tamanho).
+    Buscas por vizinhança olham só os baldes ao redor, então detectar pares
+    próximos numa frota custa O(n) em vez de comparar todos contra todos (O(n²)).
+    """
+    def __init__(self, tamanho_balde: int = TAMANHO_BALDE_PADRAO):
+        self.tamanho_balde = tamanho_balde
+        self._baldes = {} # (bx, by) -> {objeto: (x, y)}
+        self._posicoes = {} # objeto -> (x, y)
+
+    def __len__(self):
+        return len(self._posicoes)
+
+    def __contains__(self, objeto):
+        return objeto in self._posicoes
+
+    def _chave(self, x, y):
+        return (x // self.tamanho_balde, y // self.tamanho_balde)
+
+    def inserir(self, objeto, x, y):
+        if objeto in self._posicoes:
+            self.remover(objeto)
+        self._posicoes[objeto] = (x, y)
+        self._baldes.setdefault(self._chave(x, y), {})[objeto] = (x, y)
+
+    def remover(self, objeto):
+        posicao = self._posicoes.pop(objeto, None)
+        if posicao is None:
+            return
+        chave = self._chave(*posicao)
+        balde = self._baldes[chave]
+        del balde[objeto]
+        if not balde:
+            del self._baldes[chave]
+
+    def mover(self, objeto, x, y):
+        """Atualiza a posição; só troca de balde quando necessário."""
+        antiga = self._posicoes.get(objeto)
+        if antiga is not None and self._chave(*antiga) == self._chave(x, y):
+            self._posicoes[objeto] = (x, y)
+            self._baldes[self._chave(x, y)][objeto] = (x, y)
+        else:
+            self.inserir(objeto, x, y)
+
+    def posicao(self, objeto):
+        return self._posicoes.get(objeto)
+
+    def vizinhos(self, x, y, raio: float) -> list:
+        """Objetos a no máximo 'raio' de (x, y), com a distância: [(objeto, distancia)]."""
+        alcance = int(math.ceil(raio / self.tamanho_balde))
+        bx, by = self._chave(x, y)
+        encontrados = []
+        for i in range(bx - alcance, bx + alcance + 1):
+            for j in range(by - alcance, by + alcance + 1):
+                for objeto, (ox, oy) in self._baldes.get((i, j), {}).items():
+                    distancia = math.hypot(ox - x, oy - y)
+                    if distancia <= raio:
+                        encontrados.append((objeto, distancia))
+        return encontrados
+
+    def ocupantes(self, x, y) -> list:
+        """Objetos exatamente na célula (x, y)."""
+        return [objeto for objeto, (ox, oy) in self._baldes.get(self._chave(x, y), {}).items() if (ox, oy) == (x, y)]
+
+    def pares_proximos(self, distancia_minima: float) -> list:
+        """
+        Todos os pares (a, b, distancia) com distancia <= distancia_minima.
+        Cada balde é comparado consigo e com metade dos vizinhos (sem pares repetidos).
+        """
+        alcance = max(1, int(math.ceil(distancia_minima / self.tamanho_balde)))
+        # Metade da vizinhança: evita comparar o mesmo par de baldes duas vezes
+        deslocamentos = [(di, dj) for di in range(-alcance, alcance + 1) for dj in range(-alcance, alcance + 1)
+                         if (di, dj) > (0, 0)]
+        pares = []
+        for (bx, by), balde in self._baldes.items():
+            itens = list(balde.items())
+            for k, (a, (ax, ay)) in enumerate(itens):
+                for b, (cx, cy) in itens[k + 1:]:
+                    d = math.hypot(ax - cx, ay - cy)
+                    if d <= distancia_minima:
+                        pares.append((a, b, d))
+            for di, dj in deslocamentos:
+                vizinho = self._baldes.get((bx + di, by + dj))
+                if not vizinho:
+                    continue
+                for a, (ax, ay) in itens:
+                    for b, (cx, cy) in vizinho.items():
+                        d = math.hypot(ax - cx, ay - cy)
+                        if d <= distancia_minima:
+                            pares.append((a, b, d))
+        return pares
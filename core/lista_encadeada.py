@@ -5,51 +5,92 @@ class No:
     def __init__(self, dado):
         self.dado = dado
         self.proximo = None
+        self.anterior = None # Permite desligar o nó em O(1) quando achado pelo índice
 
 class ListaEncadeada:
     """Implementação manual da Lista Encadeada."""
-    def __init__(self):
+    def __init__(self, indexar_por_id: bool = False):
         self.inicio = None
         self.fim = None # Ponteiro para fim otimiza 'inserir_final'
+        self._tamanho = 0
+        # Índice opcional id -> nó (lista de Missões): remover() deixa de percorrer a lista
+        self._nos_por_id = {} if indexar_por_id else None
 
     def esta_vazia(self) -> bool:
         return self.inicio is None
 
     def inserir_final(self, dado):
         """Insere um novo nó no final da lista. O(1) se usar self.fim."""
+        if self._nos_por_id is not None and dado.id in self._nos_por_id:
+            # Sobrescrever o índice deixaria o nó antigo inalcançável por remover()
+            raise ValueError(f"ID duplicado na lista: {dado.id}")
         novo_no = No(dado)
         if self.esta_vazia():
             self.inicio = novo_no
             self.fim = novo_no
         else:
             # Manipulação explícita do ponteiro 'next'
+            novo_no.anterior = self.fim
             self.fim.proximo = novo_no
             self.fim = novo_no
+        self._tamanho += 1
+        if self._nos_por_id is not None:
+            self._nos_por_id[dado.id] = novo_no
+
+    def reindexar(self, id_antigo):
+        """Atualiza o índice depois que o dado guardado sob 'id_antigo' mudou de id."""
+        no = self._nos_por_id.pop(id_antigo)
+        if no.dado.id in self._nos_por_id:
+            self._nos_por_id[id_antigo] = no
+            raise ValueError(f"ID duplicado na lista: {no.dado.id}")
+        self._nos_por_id[no.dado.id] = no
+
+    def buscar_por_id(self, id_dado):
+        """Retorna o dado com o id informado (O(1) com índice), ou None."""
+        if self._nos_por_id is not None:
+            no = self._nos_por_id.get(id_dado)
+            return no.dado if no else None
+        atual = self.inicio
+        while atual:
+            if getattr(atual.dado, 'id', None) == id_dado:
+                return atual.dado
+            atual = atual.proximo
+        return None
 
     def remover(self, dado) -> bool:
         """Remove o primeiro nó com o dado especificado."""
         if self.esta_vazia():
             return False
-        
+
+        if self._nos_por_id is not None:
+            no = self._nos_por_id.pop(dado.id, None)
+            if no is None:
+                return False
+            self._desligar(no)
+            return True
+
         atual = self.inicio
-        anterior = None
-        
         while atual:
             # Assumindo que o dado tem um atributo 'id' para comparação (usado em Missao)
             if hasattr(atual.dado, 'id') and atual.dado.id == dado.id:
-                if anterior is None:
-                    self.inicio = atual.proximo
-                    if self.inicio is None:
-                        self.fim = None
-                else:
-                    anterior.proximo = atual.proximo
-                    if atual.proximo is None:
-                        self.fim = anterior
+                self._desligar(atual)
                 return True
-            anterior = atual
             atual = atual.proximo
         return False
 
+    def _desligar(self, no):
+        """Retira o nó da lista ajustando os ponteiros dos vizinhos."""
+        if no.anterior is None:
+            self.inicio = no.proximo
+        else:
+            no.anterior.proximo = no.proximo
+        if no.proximo is None:
+            self.fim = no.anterior
+        else:
+            no.proximo.anterior = no.anterior
+        no.anterior = no.proximo = None
+        self._tamanho -= 1
+
     def to_list(self):
         """Converte a lista encadeada em uma lista Python (para relatórios ou GUI)."""
         items = []
@@ -60,9 +101,4 @@ class ListaEncadeada:
         return items
 
     def tamanho(self) -> int:
-        contador = 0
-        atual = self.inicio
-        while atual:
-            contador += 1
-            atual = atual.proximo
-        return contador
\ No newline at end of file
+        return self._tamanho
\ No newline at end of file
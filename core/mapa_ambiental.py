@@ -0,0 +1,149 @@
+# core/mapa_ambiental.py
+import random
+from collections import OrderedDict
+
+from core.ponto_voo import indice_categoria_poluicao, LIMITES_POLUICAO, TABELA_CORES_POLUICAO
+
+try:
+    import numpy as np
+except ImportError: # NumPy é opcional: sem ele as camadas são listas
+    np = None
+
+URBANO_TYPE = "Urbano"
+RURAL_TYPE = "Rural"
+MISTO_TYPE = "Misto"
+
+AREAS_POSSIVEIS = ["urbana", "residencial", "industrial", "rural", "mata", "zona de risco"]
+PESOS_AREAS = {
+    URBANO_TYPE: [40, 20, 30, 5, 0, 5],
+    RURAL_TYPE: [5, 5, 0, 50, 35, 5],
+    MISTO_TYPE: [15, 15, 15, 20, 20, 15],
+}
+
+CAPACIDADE_CACHE_MAPAS = 8
+
+
+def gerar_dados_ambientais(map_type: str, seed: int, largura: int, altura: int) -> dict:
+    """Gera os dados ambientais de cada célula (c, r) de forma determinística pela semente."""
+    rng = random.Random(seed)
+    weights = PESOS_AREAS.get(map_type, PESOS_AREAS[MISTO_TYPE])
+    map_data = {}
+
+    for r in range(altura):
+        for c in range(largura):
+            area = rng.choices(AREAS_POSSIVEIS, weights=weights, k=1)[0]
+
+            # Definir base de poluição e densidade com base no tipo de área
+            if area == "industrial":
+                poluicao_base = rng.randint(150, 350)
+                densidade_base = rng.randint(500, 1500)
+            elif area == "mata":
+                poluicao_base = rng.randint(10, 50)
+                densidade_base = rng.randint(1, 10)
+            else:
+                poluicao_base = rng.randint(50, 150)
+                densidade_base = rng.randint(50, 500)
+
+            map_data[(c, r)] = {
+                "tipo_area": area,
+                "densidade_populacional": densidade_base + rng.randint(-50, 50),
+                "presenca_areas_verdes": rng.randint(0, 100),
+                "indice_poluicao_ar": poluicao_base + rng.randint(-10, 10),
+                "presenca_construcoes_altas": area in ["urbana", "industrial"],
+                "sinal_gps": rng.choice(["forte", "fraco", "perdido"]) if area == "zona de risco" else "forte",
+                "intensidade_ruido": rng.randint(30, 100)
+            }
+    return map_data
+
+
+class MapaAmbiental:
+    """
+    Dados ambientais de um mapa mais as camadas derivadas: AQI atual e sua
+    categoria (cor via tabela), máscara de zona de risco e de perda de GPS.
+    As camadas são planas, indexadas por r * largura + c; AQI e categoria são
+    arrays NumPy quando disponível (o AmbienteDinamico as troca a cada tick).
+    As máscaras são estáticas e calculadas uma única vez.
+
+    O AQI de self.dados é o da criação do mapa: o atual está em self.poluicao
+    (use amostrar() e dados_atuais()).
+    """
+    def __init__(self, map_type: str, largura: int, altura: int, dados: dict, seed=None, poluicao_base=None):
+        self.map_type = map_type
+        self.seed = seed
+        self.largura = largura
+        self.altura = altura
+        self.dados = dados
+        self.tabela_cores = TABELA_CORES_POLUICAO
+        self.mascara_risco = [False] * (largura * altura)
+        self.mascara_perda_gps = [False] * (largura * altura)
+        poluicao = [0] * (largura * altura)
+        for (c, r), env_data in dados.items():
+            i = self.indice(c, r)
+            poluicao[i] = env_data["indice_poluicao_ar"]
+            self.mascara_risco[i] = env_data["tipo_area"] == "zona de risco"
+            self.mascara_perda_gps[i] = env_data["sinal_gps"] == "perdido"
+        # AQI de emissão de cada célula (referência para o AmbienteDinamico).
+        # Um mapa restaurado recebe a base original: os dados já podem ter evoluído
+        self.poluicao_base = list(poluicao_base) if poluicao_base is not None else list(poluicao)
+        self.definir_poluicao(poluicao)
+
+    @classmethod
+    def gerar(cls, map_type: str, seed: int, largura: int, altura: int):
+        return cls(map_type, largura, altura, gerar_dados_ambientais(map_type, seed, largura, altura), seed=seed)
+
+    def indice(self, c: int, r: int) -> int:
+        return r * self.largura + c
+
+    def definir_poluicao(self, valores):
+        """Substitui a camada de AQI inteiro (plana) e recalcula todas as categorias."""
+        if np is not None:
+            self.poluicao = np.array(valores, dtype=np.int64).ravel()
+            self.categorias = np.searchsorted(LIMITES_POLUICAO, self.poluicao, side="left")
+        else:
+            self.poluicao = [int(v) for v in valores]
+            self.categorias = [indice_categoria_poluicao(v) for v in self.poluicao]
+
+    def amostrar(self, c: int, r: int) -> dict:
+        """Dados ambientais da célula com o AQI atual (o que o PontoDeVoo registra); {} fora do mapa."""
+        env_data = self.dados.get((c, r))
+        if env_data is None:
+            return {}
+        return dict(env_data, indice_poluicao_ar=int(self.poluicao[self.indice(c, r)]))
+
+    def dados_atuais(self) -> dict:
+        """Cópia de self.dados com o AQI atual de cada célula (para salvar a sessão)."""
+        return {(c, r): dict(env_data, indice_poluicao_ar=int(self.poluicao[self.indice(c, r)]))
+                for (c, r), env_data in self.dados.items()}
+
+    def cor(self, c: int, r: int) -> str:
+        """Cor da categoria de poluição da célula (consulta direta à tabela)."""
+        return self.tabela_cores[self.categorias[self.indice(c, r)]]
+
+
+class CacheMapas:
+    """Cache LRU limitado de mapas gerados, chaveado por (tipo, semente, largura, altura)."""
+    def __init__(self, capacidade: int = CAPACIDADE_CACHE_MAPAS):
+        self.capacidade = capacidade
+        self._mapas = OrderedDict()
+
+    def obter(self, map_type: str, seed: int, largura: int, altura: int) -> MapaAmbiental:
+        chave = (map_type, seed, largura, altura)
+        mapa = self._mapas.get(chave)
+        if mapa is not None:
+            self._mapas.move_to_end(chave)
+            return mapa
+
+        mapa = MapaAmbiental.gerar(map_type, seed, largura, altura)
+        self.inserir(mapa)
+        return mapa
+
+    def inserir(self, mapa: MapaAmbiental):
+        """Guarda um mapa já construído (ex.: restaurado de um snapshot), substituindo o da mesma chave."""
+        chave = (mapa.map_type, mapa.seed, mapa.largura, mapa.altura)
+        self._mapas[chave] = mapa
+        self._mapas.move_to_end(chave)
+        if len(self._mapas) > self.capacidade:
+            self._mapas.popitem(last=False) # Descarta o menos usado recentemente
+
+    def __len__(self):
+        return len(self._mapas)
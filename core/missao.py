@@ -1,24 +1,214 @@
 # core/missao.py
 from core.lista_encadeada import ListaEncadeada
-from core.ponto_voo import PontoDeVoo, calcular_distancia
+from core.ponto_voo import PontoDeVoo, calcular_distancia, indice_categoria_poluicao
+from core.telemetria import SeriesTelemetria
+from core.analise_intervalo import SomasPrefixadas, ArvoreSegmentosMinMax
+from core.colunar import codificar_pontos
+from core.arquivo_missao import (compactar_colunas, descompactar_pontos, descompactar_colunas, indices_frios,
+                                 partes_indices, indices_de_partes, AREA_QUENTE, COMPRESSAO_PADRAO)
+from core.registro_missoes import REGISTRO_MISSOES
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 import time
-import random 
+
+# Pontos percorridos entre verificações de cancelamento em gerar_relatorio
+INTERVALO_CANCELAMENTO = 4096
 
 class Missao:
     """Gerencia o ciclo de vida e o histórico de uma única missão."""
-    def __init__(self, tipo: str):
-        self.id = str(int(time.time() * 1000) + random.randint(0, 999)) # ID único baseado no timestamp
+    def __init__(self, tipo: str, id_missao: str = None):
+        if id_missao is None:
+            id_missao = REGISTRO_MISSOES.novo_id() # Monotônico: sem colisão entre missões da frota
+        else:
+            REGISTRO_MISSOES.reservar(id_missao) # ID restaurado não será emitido de novo
+        self.id = id_missao
         self.tipo = tipo
         self.data_inicio = datetime.now()
         self.data_fim = None
+        # Forma fria (missão finalizada e arquivada) e o relatório mantido em memória
+        self._arquivo = None
+        self._relatorio_cache = None
+        self._iniciar_estruturas_quentes()
+        self._iniciar_indices()
+
+    def _iniciar_estruturas_quentes(self):
         # LISTA ENCADEDA ANINHADA: Armazena a sequência de PontosDeVoo
-        self.pontos_voo = ListaEncadeada() 
+        self._pontos_voo = ListaEncadeada() 
+        # Séries de telemetria em buffers circulares (gráficos da aba Telemetria)
+        self._telemetria = SeriesTelemetria()
+
+    def _iniciar_indices(self):
+        # Índices para consultas de intervalo (ponto i até j ou janela de tempo).
+        # Na forma fria viram as versões compactas de indices_frios (consultas não precisam dos pontos)
+        self._instantes = [] # Segundos desde o início da missão, por ponto
+        self._soma_distancia = SomasPrefixadas() # Distância desde o ponto anterior
+        self._soma_consumo = SomasPrefixadas() # Bateria gasta desde o ponto anterior
+        self._soma_poluicao = SomasPrefixadas()
+        self._soma_densidade = SomasPrefixadas()
+        self._arvore_poluicao = ArvoreSegmentosMinMax()
+        # (x, y) -> código da categoria de AQI na primeira visita (desenho do mapa sem percorrer os pontos)
+        self._celulas_visitadas = {}
+
+    @property
+    def pontos_voo(self):
+        """Lista Encadeada de pontos; reidrata a missão se ela estiver arquivada."""
+        self._garantir_quente()
+        return self._pontos_voo
+
+    @property
+    def telemetria(self):
+        self._garantir_quente()
+        return self._telemetria
+
+    @property
+    def arquivada(self) -> bool:
+        """True enquanto os pontos existem apenas na forma fria (compactada)."""
+        return self._pontos_voo is None
+
+    def arquivar(self, compressao=COMPRESSAO_PADRAO):
+        """
+        Rebaixa a missão finalizada para a forma fria: pontos compactados
+        (ver core/arquivo_missao.py) e só o relatório permanece em memória.
+        """
+        if self._arquivo is None:
+            self.aplicar_arquivo(self.preparar_arquivo(compressao))
+        self.rebaixar()
+
+    def _definir_indices(self, indices: dict):
+        """Troca os índices quentes pelos da forma fria (arquivo_missao.indices_frios)."""
+        self._instantes = indices["instantes"]
+        self._soma_distancia = indices["distancia"]
+        self._soma_consumo = indices["consumo"]
+        self._soma_poluicao = indices["poluicao"]
+        self._soma_densidade = indices["densidade"]
+        self._arvore_poluicao = indices["poluicao"] # A coluna em blocos também responde mínimo/máximo
+        self._celulas_visitadas = None # Só o desenho da missão ativa usa; recalculado sob demanda
+
+    def preparar_arquivo(self, compressao=COMPRESSAO_PADRAO) -> dict:
+        """
+        Calcula a forma fria na thread de trabalho (GeradorRelatoriosAssincrono.arquivar);
+        a troca é feita depois, na thread da interface, por aplicar_arquivo.
+        Da missão só muda o relatório guardado: ela já foi finalizada e não muda
+        mais, então a tarefa de relatórios que vem em seguida não percorre os pontos de novo.
+        """
+        relatorio = self.gerar_relatorio()
+        if self.data_fim is not None:
+            self._relatorio_cache = relatorio
+        colunas = codificar_pontos(self._pontos_voo.to_list())
+        return {
+            "relatorio": relatorio,
+            "arquivo": compactar_colunas(colunas, compressao),
+            "indices": indices_frios(colunas, self.data_inicio.timestamp()),
+        }
+
+    def aplicar_arquivo(self, forma_fria: dict):
+        """Troca os pontos pela forma fria calculada por preparar_arquivo."""
+        if self.data_fim is None or self._arquivo is not None:
+            return # Missão ainda em andamento ou já arquivada
+        self._relatorio_cache = forma_fria["relatorio"]
+        self._arquivo = forma_fria["arquivo"]
+        self._definir_indices(forma_fria["indices"])
+        self.rebaixar()
+
+    def rebaixar(self):
+        """Descarta os pontos e a telemetria de uma missão que já tem forma fria (os índices ficam)."""
+        if self._arquivo is None or self._pontos_voo is None:
+            return
+        self._pontos_voo = None
+        self._telemetria = None
+        AREA_QUENTE.descartar(self)
+
+    def _garantir_quente(self):
+        """Reidrata os pontos a partir da forma fria (quando replay/exportação precisam deles)."""
+        if self._pontos_voo is not None:
+            if self._arquivo is not None:
+                AREA_QUENTE.registrar(self) # Já reidratada: conta como uso recente
+            return
+        pontos = descompactar_pontos(self._arquivo)
+        self._iniciar_estruturas_quentes()
+        for ponto in pontos:
+            self._pontos_voo.inserir_final(ponto)
+            self._telemetria.registrar(ponto)
+        AREA_QUENTE.registrar(self)
+
+    def dados_arquivados(self):
+        """
+        Retorna (arquivo compactado, relatório, arrays dos índices frios) se a
+        missão tem forma fria; senão None.
+        """
+        if self._arquivo is None:
+            return None
+        indices = {
+            "instantes": self._instantes,
+            "distancia": self._soma_distancia,
+            "consumo": self._soma_consumo,
+            "poluicao": self._soma_poluicao,
+            "densidade": self._soma_densidade,
+        }
+        return self._arquivo, self._relatorio_cache, partes_indices(indices)
+
+    def restaurar_arquivo(self, arquivo: bytes, relatorio: dict, partes: dict = None):
+        """
+        Carrega a missão diretamente na forma fria (ex.: snapshot). Com as
+        'partes' de dados_arquivados os índices são remontados sem tocar no
+        arquivo; sem elas (snapshots antigos) são recalculados das colunas.
+        """
+        self._arquivo = arquivo
+        self._relatorio_cache = relatorio
+        self._iniciar_estruturas_quentes()
+        if partes is not None:
+            indices = indices_de_partes(partes)
+        else:
+            indices = indices_frios(descompactar_colunas(arquivo), self.data_inicio.timestamp())
+        self._definir_indices(indices)
+        self.rebaixar()
 
     def registrar_ponto(self, x, y, nivel_bateria, environmental_data):
         """Cria e insere um novo PontoDeVoo no final da Lista Encadeada."""
         ponto = PontoDeVoo(x, y, nivel_bateria=nivel_bateria, **environmental_data)
-        self.pontos_voo.inserir_final(ponto)
+        self.adicionar_ponto(ponto)
+
+    def adicionar_ponto(self, ponto):
+        """Insere um PontoDeVoo já existente (ex.: restaurado de um snapshot)."""
+        self._garantir_quente()
+        # A missão mudou: forma fria e relatório guardados deixam de valer
+        self._arquivo = None
+        self._relatorio_cache = None
+        AREA_QUENTE.descartar(self)
+        self._indexar_ponto(ponto)
+
+    def _indexar_ponto(self, ponto):
+        anterior = self._pontos_voo.fim.dado if self._pontos_voo.fim else None
+        self._pontos_voo.inserir_final(ponto)
+        self._telemetria.registrar(ponto)
+
+        instante = getattr(ponto, "instante", None)
+        if instante is None:
+            instante = time.time()
+        self._instantes.append(instante - self.data_inicio.timestamp())
+        if anterior:
+            self._soma_distancia.adicionar(calcular_distancia(anterior.coordenadas, ponto.coordenadas))
+            self._soma_consumo.adicionar(anterior.nivel_bateria - ponto.nivel_bateria)
+        else:
+            self._soma_distancia.adicionar(0.0)
+            self._soma_consumo.adicionar(0.0)
+        self._soma_poluicao.adicionar(ponto.indice_poluicao_ar)
+        self._soma_densidade.adicionar(ponto.densidade_populacional)
+        self._arvore_poluicao.adicionar(ponto.indice_poluicao_ar)
+        if ponto.coordenadas not in self._celulas_visitadas:
+            self._celulas_visitadas[ponto.coordenadas] = indice_categoria_poluicao(ponto.indice_poluicao_ar)
+
+    def celulas_visitadas(self) -> dict:
+        """(x, y) -> índice em CATEGORIAS_POLUICAO/TABELA_CORES_POLUICAO na primeira visita à célula."""
+        if self._celulas_visitadas is not None:
+            return self._celulas_visitadas
+        # Forma fria: calcula das colunas sem guardar (a missão arquivada não é desenhada a cada quadro)
+        numericos = descompactar_colunas(self._arquivo)["numericos"]
+        celulas = {}
+        for celula, aqi in zip(zip(numericos["x"], numericos["y"]), numericos["indice_poluicao_ar"]):
+            if celula not in celulas:
+                celulas[celula] = indice_categoria_poluicao(aqi)
+        return celulas
 
     def finalizar_missao(self):
         self.data_fim = datetime.now()
@@ -27,15 +217,73 @@ class Missao:
         fim = self.data_fim if self.data_fim else datetime.now()
         return (fim - self.data_inicio).total_seconds()
 
-    def gerar_relatorio(self):
+    def consultar_intervalo(self, i: int, j: int):
+        """
+        Estatísticas entre o ponto i e o ponto j (inclusive, a partir de 0),
+        em O(log n) pelas somas prefixadas e pela árvore de segmentos.
+        Não reidrata missões arquivadas: os índices ficam sempre em memória.
+        """
+        total = len(self._instantes)
+        if total == 0:
+            return {"Relatório": "Nenhum ponto registrado."}
+        if not (0 <= i <= j < total):
+            return {"Relatório": f"Intervalo inválido (pontos de 0 a {total - 1})."}
+
+        quantidade = j - i + 1
+        # A distância/consumo do ponto i referem-se ao trecho anterior a ele: ficam fora
+        distancia = self._soma_distancia.soma(i + 1, j) if j > i else 0.0
+        consumo = self._soma_consumo.soma(i + 1, j) if j > i else 0.0
+        pol_min, pol_max = self._arvore_poluicao.consultar(i, j)
+
+        return {
+            "Intervalo (pontos)": f"{i} a {j}",
+            "Período (s)": f"{self._instantes[i]:.2f} a {self._instantes[j]:.2f}",
+            "Pontos Coletados": quantidade,
+            "Distância percorrida (unidades)": f"{distancia:.2f}",
+            "Bateria consumida (%)": round(consumo, 2),
+            "Média Poluição (AQI)": round(self._soma_poluicao.soma(i, j) / quantidade, 2),
+            "Mínima Poluição (AQI)": pol_min,
+            "Máxima Poluição (AQI)": pol_max,
+            "Média densidade populacional": round(self._soma_densidade.soma(i, j) / quantidade, 2),
+        }
+
+    def indices_no_periodo(self, inicio_s: float, fim_s: float):
+        """Retorna (i, j) dos pontos registrados entre inicio_s e fim_s segundos da missão, ou None."""
+        i = bisect_left(self._instantes, inicio_s)
+        j = bisect_right(self._instantes, fim_s) - 1
+        if i > j:
+            return None
+        return i, j
+
+    def consultar_periodo(self, inicio_s: float, fim_s: float):
+        """Mesmas estatísticas de consultar_intervalo para uma janela de tempo."""
+        indices = self.indices_no_periodo(inicio_s, fim_s)
+        if indices is None:
+            return {"Relatório": "Nenhum ponto registrado no período."}
+        return self.consultar_intervalo(*indices)
+
+    def gerar_relatorio(self, cancelamento=None, progresso=None):
         """
         Gera o relatório percorrendo a Lista Encadeada de Pontos de Voo (self.pontos_voo).
         Isto prova o uso da ED para cálculo de estatísticas.
+
+        'cancelamento' (threading.Event opcional) permite interromper o percurso
+        quando executado em segundo plano; nesse caso retorna None.
+        'progresso' (função opcional) recebe a fração de pontos já percorrida
+        nos mesmos pontos de verificação do cancelamento.
+        Missões arquivadas respondem com o relatório guardado, sem reidratar.
         """
-        if self.pontos_voo.esta_vazia():
+        if self._relatorio_cache is not None:
+            return dict(self._relatorio_cache)
+        # Lido uma única vez, sem a propriedade que reidrata: na thread de trabalho
+        # a interface pode arquivar a missão durante o percurso (a lista continua válida)
+        pontos_voo = self._pontos_voo
+        if pontos_voo is None: # Arquivada depois da verificação acima: o relatório veio junto
+            return dict(self._relatorio_cache)
+        if pontos_voo.esta_vazia():
             return {"Relatório": "Nenhum ponto registrado."}
         
-        atual = self.pontos_voo.inicio
+        atual = pontos_voo.inicio
         anterior = None
         
         # Variáveis acumuladoras (necessárias pelo percurso)
@@ -43,9 +291,10 @@ class Missao:
         soma_poluicao = 0.0
         soma_densidade = 0.0
         soma_vegetacao = 0.0
-        bateria_inicial = self.pontos_voo.inicio.dado.nivel_bateria
-        bateria_final = self.pontos_voo.fim.dado.nivel_bateria
+        bateria_inicial = pontos_voo.inicio.dado.nivel_bateria
+        bateria_final = pontos_voo.fim.dado.nivel_bateria
         contador = 0
+        total_pontos = pontos_voo.tamanho()
         
         pol_categoria_freq = {} # Usado para o relatório de insalubridade
 
@@ -70,6 +319,13 @@ class Missao:
             anterior = atual
             atual = atual.proximo
             contador += 1
+
+            # Verifica o cancelamento e informa o progresso a cada bloco de pontos (barato em missões longas)
+            if contador % INTERVALO_CANCELAMENTO == 0:
+                if cancelamento is not None and cancelamento.is_set():
+                    return None
+                if progresso is not None:
+                    progresso(contador / total_pontos)
             
         # --- CÁLCULOS FINAIS ---
         consumo_total = bateria_inicial - bateria_final
@@ -1,6 +1,25 @@
 # core/ponto_voo.py
 import random
 import math
+import time
+from bisect import bisect_left
+
+# Limites superiores (inclusivos) de AQI de cada categoria; acima do último é "Perigosa"
+LIMITES_POLUICAO = [40, 80, 120, 200, 300]
+CATEGORIAS_POLUICAO = [
+    ("Ótima", "#00FF00"),
+    ("Moderada", "#FFFF00"),
+    ("Insalubre (sensíveis)", "#FFA500"),
+    ("Insalubre", "#FF0000"),
+    ("Muito insalubre", "#800080"),
+    ("Perigosa", "#8B0000"),
+]
+# Tabela de cores indexada pela categoria (usada no desenho do mapa)
+TABELA_CORES_POLUICAO = [cor for _, cor in CATEGORIAS_POLUICAO]
+
+def indice_categoria_poluicao(indice_poluicao_ar) -> int:
+    """Retorna o índice em CATEGORIAS_POLUICAO para um valor de AQI (busca binária)."""
+    return bisect_left(LIMITES_POLUICAO, indice_poluicao_ar)
 
 def calcular_distancia(coord1: tuple, coord2: tuple) -> float:
     """Calcula a distância euclidiana entre dois pontos (células do mapa)."""
@@ -14,6 +33,7 @@ class PontoDeVoo:
     def __init__(self, x, y, nivel_bateria, **environmental_data):
         self.coordenadas = (x, y)
         self.nivel_bateria = nivel_bateria # Recebido do drone
+        self.instante = time.time() # Momento da coleta (consultas por janela de tempo)
 
         # Dados de Telemetria (gerados aleatoriamente ou fixos)
         self.altitude = random.randint(30, 150)
@@ -33,6 +53,12 @@ class PontoDeVoo:
         self.sinal_gps = environmental_data.get("sinal_gps", "forte")
         self.intensidade_ruido = environmental_data.get("intensidade_ruido", 50)
 
+    @classmethod
+    def restaurar(cls, campos: dict):
+        """Recria um ponto a partir de atributos já conhecidos (sem sortear telemetria)."""
+        ponto = cls.__new__(cls)
+        ponto.__dict__.update(campos)
+        return ponto
 
     def gerar_telemetria_aleatoria(self, current_battery):
         """Atualiza dados de telemetria baseados no estado atual do drone."""
@@ -40,19 +66,7 @@ class PontoDeVoo:
 
     def categoria_poluicao(self):
         """Retorna a categoria e a cor da poluição do ar com base no índice."""
-        p = self.indice_poluicao_ar
-        if p <= 40:
-            return "Ótima", "#00FF00"
-        elif 41 <= p <= 80:
-            return "Moderada", "#FFFF00"
-        elif 81 <= p <= 120:
-            return "Insalubre (sensíveis)", "#FFA500"
-        elif 121 <= p <= 200:
-            return "Insalubre", "#FF0000"
-        elif 201 <= p <= 300:
-            return "Muito insalubre", "#800080"
-        else:
-            return "Perigosa", "#8B0000"
+        return CATEGORIAS_POLUICAO[indice_categoria_poluicao(self.indice_poluicao_ar)]
 
     def __str__(self):
         return f"Ponto({self.coordenadas[0]},{self.coordenadas[1]}) - Bateria: {self.nivel_bateria:.1f}%"
\ No newline at end of file
@@ -0,0 +1,177 @@
+# core/registro_missoes.py
+import itertools
+import time
+from bisect import bisect_left, bisect_right, insort
+
+
+class RegistroMissoes:
+    """
+    Registro de missões da frota inteira.
+
+    Emite IDs monotônicos (sem colisão, mesmo com várias missões no mesmo
+    milissegundo) e mantém índices por id, drone e tipo (dicts, O(1)) e por
+    data de início (lista ordenada, consultas de período com bisect).
+
+    A contagem começa na época da sessão (instante de criação em ms × 1000):
+    sessões diferentes não repetem IDs, exportações de processos distintos
+    podem ser combinadas e os IDs antigos, do relógio em ms, ficam abaixo dela.
+    """
+    def __init__(self, epoca: int = None):
+        if epoca is None:
+            epoca = time.time_ns() // 1_000_000 * 1000
+        self._proximo = epoca # Menor ID ainda não emitido nem reservado
+        self._por_id = {} # id -> missao
+        self._chaves = {} # id -> (drone, tipo, entrada em _inicios) usados no registro
+        self._por_drone = {} # identificador -> {id: missao} (ordem de registro)
+        self._por_tipo = {} # tipo -> {id: missao}
+        self._inicios = [] # (data_inicio, ordem, id) ordenados
+        self._ordem = itertools.count() # Desempate estável entre inícios iguais
+
+    def __len__(self):
+        return len(self._por_id)
+
+    def __contains__(self, id_missao):
+        return id_missao in self._por_id
+
+    def novo_id(self) -> str:
+        """Emite o próximo ID (string, como Missao.id sempre foi)."""
+        numero = self._proximo
+        self._proximo += 1
+        return str(numero)
+
+    def reservar(self, id_missao: str):
+        """Garante que IDs restaurados (ex.: snapshot) nunca sejam emitidos de novo."""
+        try:
+            numero = int(id_missao)
+        except (TypeError, ValueError):
+            return
+        self._proximo = max(self._proximo, numero + 1)
+
+    def registrar(self, missao, identificador_drone: str):
+        if missao.id in self._por_id:
+            if self._por_id[missao.id] is missao:
+                return
+            raise ValueError(f"ID de missão duplicado: {missao.id}")
+        self.reservar(missao.id)
+        entrada = (missao.data_inicio, next(self._ordem), missao.id)
+        self._por_id[missao.id] = missao
+        self._chaves[missao.id] = (identificador_drone, missao.tipo, entrada)
+        self._por_drone.setdefault(identificador_drone, {})[missao.id] = missao
+        self._por_tipo.setdefault(missao.tipo, {})[missao.id] = missao
+        insort(self._inicios, entrada) # Missões novas começam depois das demais: insere no fim
+
+    def remover(self, missao) -> bool:
+        if self._por_id.get(missao.id) is not missao:
+            return False
+        del self._por_id[missao.id]
+        drone, tipo, entrada = self._chaves.pop(missao.id)
+        self._descartar_indice(self._por_drone, drone, missao.id)
+        self._descartar_indice(self._por_tipo, tipo, missao.id)
+        del self._inicios[bisect_left(self._inicios, entrada)]
+        return True
+
+    @staticmethod
+    def _descartar_indice(indice: dict, chave, id_missao):
+        missoes = indice[chave]
+        del missoes[id_missao]
+        if not missoes:
+            del indice[chave]
+
+    def remover_drone(self, identificador_drone: str):
+        """Remove todas as missões de um drone (ex.: drone que saiu da frota)."""
+        for missao in list(self._por_drone.get(identificador_drone, {}).values()):
+            self.remover(missao)
+
+    def limpar(self):
+        """Esvazia os índices; os IDs continuam monotônicos."""
+        self._por_id.clear()
+        self._chaves.clear()
+        self._por_drone.clear()
+        self._por_tipo.clear()
+        self._inicios.clear()
+
+    def reconstruir(self, drones):
+        """
+        Reindexa a frota a partir dos drones (ex.: depois de carregar uma sessão).
+        Não levanta erro: uma missão cujo ID já pertence a outra recebe um ID novo.
+        """
+        drones = list(drones)
+        self.limpar()
+        for drone in drones:
+            for missao in self._missoes_de(drone):
+                self.reservar(missao.id) # Os IDs novos não podem colidir com os que ainda vão ser registrados
+        for drone in drones:
+            for missao in drone.missoes.to_list():
+                if missao.id in self._por_id:
+                    id_antigo = missao.id
+                    missao.id = self.novo_id()
+                    drone.missoes.reindexar(id_antigo)
+                self.registrar(missao, drone.identificador)
+            ativa = drone.missao_ativa
+            if ativa is not None:
+                if ativa.id in self._por_id:
+                    ativa.id = self.novo_id()
+                self.registrar(ativa, drone.identificador)
+
+    @staticmethod
+    def _missoes_de(drone) -> list:
+        missoes = drone.missoes.to_list()
+        if drone.missao_ativa is not None:
+            missoes.append(drone.missao_ativa)
+        return missoes
+
+    def do_drone(self, identificador_drone: str, finalizadas: bool = False) -> list:
+        """Missões de um drone na ordem de registro (opcionalmente só as finalizadas)."""
+        missoes = self._por_drone.get(identificador_drone, {}).values()
+        if finalizadas:
+            return [m for m in missoes if m.data_fim is not None]
+        return list(missoes)
+
+    def do_tipo(self, tipo: str) -> list:
+        return list(self._por_tipo.get(tipo, {}).values())
+
+    def tipos(self, identificador_drone: str = None) -> list:
+        if identificador_drone is None:
+            return sorted(self._por_tipo)
+        return sorted({m.tipo for m in self._por_drone.get(identificador_drone, {}).values()})
+
+    def consultar(self, identificador_drone: str = None, tipo: str = None, inicio=None, fim=None,
+                  finalizadas: bool = False) -> list:
+        """
+        Missões que atendem a todos os filtros informados (None = sem filtro).
+        Com período, parte do índice de inícios (ordem de início); senão, do
+        índice do drone ou do tipo (ordem de registro).
+        """
+        if inicio is not None or fim is not None:
+            candidatas = self.no_periodo(inicio, fim)
+        elif identificador_drone is not None:
+            candidatas = self.do_drone(identificador_drone)
+        elif tipo is not None:
+            candidatas = self.do_tipo(tipo)
+        else:
+            candidatas = self._por_id.values()
+
+        resultado = []
+        for missao in candidatas:
+            drone, tipo_registrado, _ = self._chaves[missao.id]
+            if identificador_drone is not None and drone != identificador_drone:
+                continue
+            if tipo is not None and tipo_registrado != tipo:
+                continue
+            if finalizadas and missao.data_fim is None:
+                continue
+            resultado.append(missao)
+        return resultado
+
+    def no_periodo(self, inicio=None, fim=None) -> list:
+        """Missões iniciadas entre 'inicio' e 'fim' (datetimes, inclusive; None = sem limite)."""
+        esquerda = 0 if inicio is None else bisect_left(self._inicios, (inicio,))
+        if fim is None:
+            direita = len(self._inicios)
+        else:
+            # (fim, infinito): inclui todas as entradas com data_inicio == fim
+            direita = bisect_right(self._inicios, (fim, float("inf")))
+        return [self._por_id[id_missao] for _, _, id_missao in self._inicios[esquerda:direita]]
+
+
+REGISTRO_MISSOES = RegistroMissoes()
@@ -0,0 +1,90 @@
+# core/relatorio_assincrono.py
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class GeradorRelatoriosAssincrono:
+    """
+    Calcula os relatórios das missões em uma thread de trabalho.
+
+    A thread nunca toca na interface: cada resultado vira uma mensagem na
+    fila, que a GUI consome periodicamente (root.after). Mensagens:
+      ("progresso", tarefa, concluidos, total) -> fracionário dentro de missões longas
+      ("relatorio", tarefa, indice, missao, relatorio)
+      ("concluido", tarefa, cancelada)
+      ("arquivada", None, missao, forma_fria) -> aplicar com missao.aplicar_arquivo
+    """
+    def __init__(self):
+        self.fila = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="relatorios")
+        self._cancelamento = None
+        self._contador_tarefas = 0
+        self._arquivamentos_pendentes = 0
+
+    def iniciar(self, missoes: list) -> int:
+        """Cancela a tarefa anterior (se houver) e agenda uma nova. Retorna o id da tarefa."""
+        self.cancelar()
+        self._contador_tarefas += 1
+        tarefa = self._contador_tarefas
+        self._cancelamento = threading.Event()
+        self._executor.submit(self._executar, tarefa, list(missoes), self._cancelamento)
+        return tarefa
+
+    def cancelar(self):
+        if self._cancelamento is not None:
+            self._cancelamento.set()
+            self._cancelamento = None
+
+    def tarefa_atual(self) -> int:
+        return self._contador_tarefas
+
+    def arquivar(self, missao):
+        """
+        Agenda a compactação de uma missão finalizada. Não é cancelado junto
+        com os relatórios: a forma fria chega pela fila como "arquivada".
+        """
+        self._arquivamentos_pendentes += 1
+        self._executor.submit(self._arquivar, missao)
+
+    def arquivamentos_pendentes(self) -> int:
+        return self._arquivamentos_pendentes
+
+    def coletar(self, limite: int = 50) -> list:
+        """Retira até 'limite' mensagens da fila sem bloquear."""
+        mensagens = []
+        while len(mensagens) < limite:
+            try:
+                mensagem = self.fila.get_nowait()
+            except queue.Empty:
+                break
+            if mensagem[0] == "arquivada":
+                self._arquivamentos_pendentes -= 1
+            mensagens.append(mensagem)
+        return mensagens
+
+    def encerrar(self):
+        self.cancelar()
+        self._executor.shutdown(wait=False)
+
+    def _executar(self, tarefa, missoes, cancelamento):
+        total = len(missoes)
+        self.fila.put(("progresso", tarefa, 0, total))
+        for i, missao in enumerate(missoes):
+            if cancelamento.is_set():
+                break
+            relatorio = missao.gerar_relatorio(
+                cancelamento, lambda fracao, i=i: self.fila.put(("progresso", tarefa, i + fracao, total)))
+            if relatorio is None: # Cancelado no meio do percurso
+                break
+            self.fila.put(("relatorio", tarefa, i, missao, relatorio))
+            self.fila.put(("progresso", tarefa, i + 1, total))
+        self.fila.put(("concluido", tarefa, cancelamento.is_set()))
+
+    def _arquivar(self, missao):
+        forma_fria = None
+        try:
+            forma_fria = missao.preparar_arquivo()
+        finally:
+            # Sempre responde, para a GUI não esperar para sempre por um arquivamento
+            self.fila.put(("arquivada", None, missao, forma_fria))
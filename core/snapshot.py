@@ -0,0 +1,271 @@
+# core/snapshot.py
+import mmap
+import os
+import pickle
+import struct
+import zlib
+from array import array
+
+from core.colunar import codificar_pontos, decodificar_pontos
+from core.drone import Drone
+from core.missao import Missao
+from core.registro_missoes import REGISTRO_MISSOES
+
+# Layout do arquivo:
+#   MAGICO (8 bytes) | flags (u32) | tamanho do cabeçalho (u64)
+#   cabeçalho = pickle protocolo 5 (metadados + tamanhos dos buffers)
+#   corpo     = buffers fora de banda (colunas dos pontos, arquivos e índices das
+#               missões arquivadas), alinhados em 8 bytes
+# Com FLAG_COMPRIMIDO o corpo inteiro é comprimido com zlib.
+MAGICO = b"DRNSNAP1"
+FLAG_COMPRIMIDO = 0x1
+_PREFIXO = struct.Struct("<8sIQ")
+_ALINHAMENTO = 8
+
+
+class ErroSnapshot(Exception):
+    """Arquivo de snapshot inválido ou incompatível."""
+
+
+def salvar_snapshot(caminho: str, sessao: dict, comprimir: bool = False):
+    """
+    Grava o estado completo da sessão em um único arquivo.
+    'sessao' contém: drones (dict id -> Drone, cada um com sua posição),
+    drone_selecionado_id, map_type e environmental_map_data; opcionalmente
+    map_seeds (tipo de mapa -> semente), para os outros mapas voltarem iguais,
+    poluicao_base (emissão original do mapa) e estado_ambiente
+    (AmbienteDinamico.estado()), para a poluição continuar evoluindo igual.
+    """
+    estado = {
+        "drones": [_drone_para_estado(d) for d in sessao["drones"].values()],
+        "drone_selecionado_id": sessao["drone_selecionado_id"],
+        "map_type": sessao["map_type"],
+        "environmental_map_data": sessao["environmental_map_data"],
+        "map_seeds": sessao.get("map_seeds"),
+        "poluicao_base": sessao.get("poluicao_base"),
+        "estado_ambiente": sessao.get("estado_ambiente"),
+    }
+
+    buffers = []
+    metadados = pickle.dumps(estado, protocol=5, buffer_callback=buffers.append)
+    visoes = [b.raw() for b in buffers]
+    cabecalho = pickle.dumps({"metadados": metadados, "tamanhos": [v.nbytes for v in visoes]}, protocol=5)
+
+    corpo = bytearray()
+    for visao in visoes:
+        corpo += visao
+        corpo += b"\0" * (-len(corpo) % _ALINHAMENTO)
+
+    flags = 0
+    if comprimir:
+        corpo = zlib.compress(corpo)
+        flags |= FLAG_COMPRIMIDO
+
+    # Escreve em arquivo temporário e troca atomicamente
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(_PREFIXO.pack(MAGICO, flags, len(cabecalho)))
+        arquivo.write(cabecalho)
+        arquivo.write(b"\0" * (-(_PREFIXO.size + len(cabecalho)) % _ALINHAMENTO))
+        arquivo.write(corpo)
+    os.replace(temporario, caminho)
+
+
+def carregar_snapshot(caminho: str, posicao_padrao: tuple = (0, 0)) -> dict:
+    """
+    Lê um snapshot gravado por salvar_snapshot e reconstrói os objetos.
+    'posicao_padrao' posiciona os drones de arquivos anteriores à frota,
+    que guardavam só a posição do drone selecionado.
+    O arquivo é mapeado (mmap) só para evitar copiá-lo inteiro na leitura:
+    as colunas são interpretadas com memoryview.cast, mas os pontos ativos
+    viram PontoDeVoo e nada continua mapeado depois do retorno.
+    Os IDs do arquivo são reservados no REGISTRO_MISSOES e IDs repetidos
+    (arquivos antigos, com IDs do relógio) recebem um novo; as missões não
+    entram no registro: quem adota a sessão chama reconstruir(drones).
+    Usa pickle: carregue apenas snapshots de origem confiável.
+    """
+    with open(caminho, "rb") as arquivo:
+        if os.fstat(arquivo.fileno()).st_size == 0:
+            raise ErroSnapshot("Arquivo de snapshot vazio.")
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            visao_mapa = memoryview(mapa)
+            try:
+                return _ler_snapshot(visao_mapa, posicao_padrao)
+            finally:
+                visao_mapa.release()
+
+
+def _ler_snapshot(dados: memoryview, posicao_padrao: tuple) -> dict:
+    if len(dados) < _PREFIXO.size:
+        raise ErroSnapshot("Arquivo de snapshot truncado.")
+    magico, flags, tamanho_cabecalho = _PREFIXO.unpack_from(dados)
+    if magico != MAGICO:
+        raise ErroSnapshot("Arquivo não é um snapshot do simulador.")
+
+    inicio_cabecalho = _PREFIXO.size
+    bytes_cabecalho = dados[inicio_cabecalho:inicio_cabecalho + tamanho_cabecalho]
+    try:
+        cabecalho = pickle.loads(bytes_cabecalho)
+        tamanhos = cabecalho["tamanhos"]
+        metadados = cabecalho["metadados"]
+    except Exception as e: # Bytes corrompidos fazem o pickle levantar erros de vários tipos
+        raise ErroSnapshot(f"Cabeçalho do snapshot corrompido ({type(e).__name__}).") from e
+    finally:
+        bytes_cabecalho.release()
+    inicio_corpo = inicio_cabecalho + tamanho_cabecalho
+    inicio_corpo += -inicio_corpo % _ALINHAMENTO
+
+    corpo = dados[inicio_corpo:]
+    if flags & FLAG_COMPRIMIDO:
+        comprimido = corpo
+        try:
+            corpo = memoryview(zlib.decompress(comprimido))
+        except zlib.error as e:
+            raise ErroSnapshot("Corpo comprimido do snapshot corrompido.") from e
+        finally:
+            # A fatia sobre o mmap precisa ser liberada mesmo em erro (senão o mmap não fecha)
+            comprimido.release()
+
+    fatias = []
+    try:
+        deslocamento = 0
+        for tamanho in tamanhos:
+            if deslocamento + tamanho > len(corpo):
+                raise ErroSnapshot("Arquivo de snapshot truncado.")
+            fatias.append(corpo[deslocamento:deslocamento + tamanho])
+            deslocamento += tamanho + (-tamanho % _ALINHAMENTO)
+
+        estado = pickle.loads(metadados, buffers=fatias)
+        for estado_drone in estado["drones"]:
+            for estado_missao in _estados_das_missoes(estado_drone):
+                REGISTRO_MISSOES.reservar(estado_missao["id"]) # Antes de emitir IDs para os repetidos
+        ids_usados = set()
+        drones = {}
+        for estado_drone in estado["drones"]:
+            padrao = posicao_padrao
+            if estado_drone["identificador"] == estado["drone_selecionado_id"]:
+                # Formato anterior à frota: uma única posição, a do drone selecionado
+                padrao = estado.get("posicao", posicao_padrao)
+            drone = _estado_para_drone(estado_drone, padrao, ids_usados)
+            drones[drone.identificador] = drone
+    except ErroSnapshot:
+        raise
+    except Exception as e:
+        raise ErroSnapshot(f"Conteúdo do snapshot corrompido ou incompatível ({type(e).__name__}).") from e
+    finally:
+        # Nenhuma visão pode sobreviver ao fechamento do mmap
+        for fatia in fatias:
+            fatia.release()
+        corpo.release()
+
+    return {
+        "drones": drones,
+        "drone_selecionado_id": estado["drone_selecionado_id"],
+        "map_type": estado["map_type"],
+        "environmental_map_data": estado["environmental_map_data"],
+        # None em arquivos anteriores a estes campos
+        "map_seeds": estado.get("map_seeds"),
+        "poluicao_base": estado.get("poluicao_base"),
+        "estado_ambiente": estado.get("estado_ambiente"),
+    }
+
+
+def _colunas_fora_de_banda(colunas: dict) -> dict:
+    """Envolve os arrays em PickleBuffer para que o pickle os grave fora de banda."""
+    return {
+        "n": colunas["n"],
+        "numericos": {campo: pickle.PickleBuffer(arr) for campo, arr in colunas["numericos"].items()},
+        "categoricos": {campo: (vocab, pickle.PickleBuffer(codigos)) for campo, (vocab, codigos) in colunas["categoricos"].items()},
+    }
+
+
+def _partes_fora_de_banda(partes: dict) -> dict:
+    """Arrays dos índices frios como (typecode, PickleBuffer): gravados fora de banda, como as colunas."""
+    return {campo: {nome: (arr.typecode, pickle.PickleBuffer(arr)) for nome, arr in arrays.items()}
+            for campo, arrays in partes.items()}
+
+
+def _partes_de_buffers(partes: dict) -> dict:
+    """Copia cada buffer para um array próprio (a visão sobre o mmap não sobrevive ao fechamento)."""
+    arrays = {}
+    for campo, buffers in partes.items():
+        arrays[campo] = {}
+        for nome, (typecode, buffer) in buffers.items():
+            arr = array(typecode)
+            arr.frombytes(buffer)
+            arrays[campo][nome] = arr
+    return arrays
+
+
+def _missao_para_estado(missao: Missao) -> dict:
+    estado = {
+        "id": missao.id,
+        "tipo": missao.tipo,
+        "data_inicio": missao.data_inicio,
+        "data_fim": missao.data_fim,
+    }
+    arquivados = missao.dados_arquivados()
+    if arquivados is not None:
+        # Missão arquivada: grava a forma fria como está, sem reidratar os pontos
+        arquivo, relatorio, partes = arquivados
+        estado["arquivo"] = pickle.PickleBuffer(arquivo)
+        estado["relatorio"] = relatorio
+        # Índices compactos ao lado do arquivo: a carga não precisa descompactá-lo
+        estado["indices"] = _partes_fora_de_banda(partes)
+    else:
+        estado["pontos"] = _colunas_fora_de_banda(codificar_pontos(missao.pontos_voo.to_list()))
+    return estado
+
+
+def _estados_das_missoes(estado_drone: dict) -> list:
+    estados = list(estado_drone["missoes"])
+    if estado_drone["missao_ativa"] is not None:
+        estados.append(estado_drone["missao_ativa"])
+    return estados
+
+
+def _estado_para_missao(estado: dict, ids_usados: set) -> Missao:
+    id_missao = estado["id"]
+    if id_missao in ids_usados:
+        id_missao = REGISTRO_MISSOES.novo_id()
+    ids_usados.add(id_missao)
+    missao = Missao(estado["tipo"], id_missao)
+    missao.data_inicio = estado["data_inicio"]
+    missao.data_fim = estado["data_fim"]
+    if "arquivo" in estado:
+        # Copia o buffer: a visão sobre o mmap não sobrevive ao fechamento do arquivo
+        partes = estado.get("indices") # Ausente em arquivos anteriores: recalculados do arquivo
+        if partes is not None:
+            partes = _partes_de_buffers(partes)
+        missao.restaurar_arquivo(bytes(estado["arquivo"]), estado["relatorio"], partes)
+    else:
+        for ponto in decodificar_pontos(estado["pontos"]):
+            missao.adicionar_ponto(ponto)
+    return missao
+
+
+def _drone_para_estado(drone: Drone) -> dict:
+    return {
+        "identificador": drone.identificador,
+        "modelo": drone.modelo,
+        "imagem_path": drone.imagem_path,
+        "bateria": drone.bateria,
+        "initial_battery": drone.initial_battery,
+        "posicao": (drone.x, drone.y),
+        "missoes": [_missao_para_estado(m) for m in drone.missoes.to_list()],
+        "missao_ativa": _missao_para_estado(drone.missao_ativa) if drone.missao_ativa else None,
+    }
+
+
+def _estado_para_drone(estado: dict, posicao_padrao: tuple, ids_usados: set) -> Drone:
+    drone = Drone(estado["identificador"], estado["modelo"])
+    drone.imagem_path = estado["imagem_path"]
+    drone.bateria = estado["bateria"]
+    drone.initial_battery = estado["initial_battery"]
+    for estado_missao in estado["missoes"]:
+        drone.missoes.inserir_final(_estado_para_missao(estado_missao, ids_usados))
+    if estado["missao_ativa"] is not None:
+        drone.missao_ativa = _estado_para_missao(estado["missao_ativa"], ids_usados)
+
+    drone.x, drone.y = estado.get("posicao", posicao_padrao)
+    return drone
@@ -0,0 +1,98 @@
+# core/telemetria.py
+
+# Séries exibidas nos gráficos da aba de Telemetria (nome -> atributo do PontoDeVoo)
+SERIES_TELEMETRIA = {
+    "Bateria (%)": "nivel_bateria",
+    "Altitude (m)": "altitude",
+    "Velocidade (km/h)": "velocidade",
+    "Poluição (AQI)": "indice_poluicao_ar",
+    "Ruído (dB)": "intensidade_ruido",
+}
+
+CAPACIDADE_PADRAO = 4096
+
+
+class BufferCircular:
+    """Buffer de capacidade fixa: ao encher, sobrescreve as amostras mais antigas."""
+    def __init__(self, capacidade: int = CAPACIDADE_PADRAO):
+        if capacidade <= 0:
+            raise ValueError("A capacidade do buffer deve ser positiva.")
+        self.capacidade = capacidade
+        self._dados = [0.0] * capacidade
+        self._inicio = 0 # Índice da amostra mais antiga
+        self._tamanho = 0
+        self.total_inserido = 0 # Contador global (eixo X dos gráficos)
+
+    def inserir(self, valor: float):
+        """Insere uma amostra em O(1)."""
+        fim = (self._inicio + self._tamanho) % self.capacidade
+        self._dados[fim] = valor
+        if self._tamanho < self.capacidade:
+            self._tamanho += 1
+        else:
+            self._inicio = (self._inicio + 1) % self.capacidade
+        self.total_inserido += 1
+
+    def __len__(self):
+        return self._tamanho
+
+    def valores(self) -> list:
+        """Retorna as amostras em ordem cronológica (da mais antiga para a mais recente)."""
+        fim = self._inicio + self._tamanho
+        if fim <= self.capacidade:
+            return self._dados[self._inicio:fim]
+        return self._dados[self._inicio:] + self._dados[:fim - self.capacidade]
+
+    def ultimo(self):
+        if self._tamanho == 0:
+            return None
+        return self._dados[(self._inicio + self._tamanho - 1) % self.capacidade]
+
+
+def reduzir_min_max(valores: list, largura: int) -> list:
+    """
+    Reduz uma série para no máximo ~2*largura pontos (min/max por coluna de pixel).
+    O custo de desenho passa a depender da largura do gráfico, não do tamanho da missão.
+    Retorna pares (índice, valor) preservando picos e vales de cada balde.
+    """
+    n = len(valores)
+    if largura <= 0 or n == 0:
+        return []
+    if n <= 2 * largura:
+        return list(enumerate(valores))
+
+    pontos = []
+    tamanho_balde = n / largura
+    for b in range(largura):
+        ini = int(b * tamanho_balde)
+        fim = min(n, int((b + 1) * tamanho_balde))
+        if ini >= fim:
+            continue
+        balde = valores[ini:fim]
+        menor = min(balde)
+        maior = max(balde)
+        i_min = ini + balde.index(menor)
+        i_max = ini + balde.index(maior)
+        # Mantém a ordem temporal entre o mínimo e o máximo do balde
+        if i_min <= i_max:
+            pontos.append((i_min, menor))
+            if i_max != i_min:
+                pontos.append((i_max, maior))
+        else:
+            pontos.append((i_max, maior))
+            pontos.append((i_min, menor))
+    return pontos
+
+
+class SeriesTelemetria:
+    """Agrupa um BufferCircular por série de telemetria de uma missão."""
+    def __init__(self, capacidade: int = CAPACIDADE_PADRAO):
+        self.buffers = {nome: BufferCircular(capacidade) for nome in SERIES_TELEMETRIA}
+
+    def registrar(self, ponto):
+        """Amostra os atributos do PontoDeVoo em cada série."""
+        for nome, atributo in SERIES_TELEMETRIA.items():
+            self.buffers[nome].inserir(float(getattr(ponto, atributo, 0)))
+
+    def serie_reduzida(self, nome: str, largura: int) -> list:
+        return reduzir_min_max(self.buffers[nome].valores(), largura)
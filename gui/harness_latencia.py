@@ -0,0 +1,317 @@
+# gui/harness_latencia.py
+"""
+Harness de latência da interface sem display.
+
+Substitui tk/ttk/diálogos do módulo gui.interface por dublês que apenas
+registram as chamadas, reproduz uma sessão roteirizada (iniciar missão,
+N movimentos, finalizar, trocar de drone e de mapa) e emite em JSON a
+latência p50/p99 de cada handler e os itens de canvas criados por ação.
+
+Uso (a partir da raiz do projeto):
+    python -m gui.harness_latencia --movimentos 200 --saida latencia.json
+    python -m gui.harness_latencia --orcamento-p99-ms 16   # falha (código 1) se estourar
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import time
+import types
+from contextlib import contextmanager
+
+import gui.interface as interface
+
+LARGURA_CANVAS = 760
+ALTURA_CANVAS = 450
+
+# Handlers de InterfaceDrone cujo tempo é medido
+HANDLERS_MEDIDOS = [
+    "desenhar_mapa",
+    "update_telemetry_display",
+    "desenhar_graficos_telemetria",
+    "exibir_relatorio",
+    "_coletar_relatorios",
+    "iniciar_missao",
+    "mover_drone",
+    "finalizar_missao",
+    "on_drone_select",
+    "on_map_select",
+    "_tick_ambiente",
+]
+
+DIRECOES = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+
+class WidgetFalso:
+    """Dublê genérico de widget Tk: aceita qualquer chamada e guarda a configuração."""
+    def __init__(self, *args, **kwargs):
+        self._config = dict(kwargs)
+        self._valor = ""
+        self._itens = {}
+
+    def __getattr__(self, nome):
+        # pack, grid, bind, tag_configure, yview... viram no-ops
+        return lambda *args, **kwargs: None
+
+    def config(self, *args, **kwargs):
+        self._config.update(kwargs)
+
+    configure = config
+
+    def __setitem__(self, chave, valor):
+        self._itens[chave] = valor
+
+    def __getitem__(self, chave):
+        return self._itens.get(chave, 0)
+
+    def get(self, *args):
+        return self._valor
+
+    def set(self, valor):
+        self._valor = str(valor)
+
+    def insert(self, indice, texto, *args):
+        self._valor += str(texto)
+
+    def delete(self, *args):
+        self._valor = ""
+
+
+class CanvasGravador(WidgetFalso):
+    """Dublê de tk.Canvas que conta os itens criados e apagados."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.itens_criados = 0
+        self.itens_por_tipo = {}
+        self.exclusoes = 0
+
+    def winfo_width(self):
+        return LARGURA_CANVAS
+
+    def winfo_height(self):
+        return ALTURA_CANVAS
+
+    def _criar(self, tipo):
+        self.itens_criados += 1
+        self.itens_por_tipo[tipo] = self.itens_por_tipo.get(tipo, 0) + 1
+        return self.itens_criados
+
+    def create_line(self, *args, **kwargs):
+        return self._criar("line")
+
+    def create_rectangle(self, *args, **kwargs):
+        return self._criar("rectangle")
+
+    def create_text(self, *args, **kwargs):
+        return self._criar("text")
+
+    def create_image(self, *args, **kwargs):
+        return self._criar("image")
+
+    def create_polygon(self, *args, **kwargs):
+        return self._criar("polygon")
+
+    def create_oval(self, *args, **kwargs):
+        return self._criar("oval")
+
+    def delete(self, *args):
+        self.exclusoes += 1
+
+
+class RootFalso(WidgetFalso):
+    """Dublê da janela raiz: root.after enfileira callbacks executados pelo harness."""
+    def __init__(self):
+        super().__init__()
+        self.pendentes = []
+
+    def after(self, ms, funcao=None, *args):
+        self.pendentes.append((funcao, args))
+        return f"after#{len(self.pendentes)}"
+
+    def executar_pendentes(self) -> int:
+        lote, self.pendentes = self.pendentes, []
+        for funcao, args in lote:
+            if funcao is not None:
+                funcao(*args)
+        return len(lote)
+
+
+class Cronometro:
+    """Acumula amostras de latência (ms) por nome."""
+    def __init__(self):
+        self.amostras = {}
+
+    def registrar(self, nome, ms):
+        self.amostras.setdefault(nome, []).append(ms)
+
+    def envolver(self, nome, funcao):
+        def medido(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                self.registrar(nome, (time.perf_counter() - inicio) * 1000)
+        return medido
+
+
+def _percentil(valores: list, p: float) -> float:
+    """Percentil pelo método do posto mais próximo."""
+    ordenados = sorted(valores)
+    posto = max(1, math.ceil(p / 100 * len(ordenados)))
+    return ordenados[posto - 1]
+
+
+def _resumir(amostras: list) -> dict:
+    return {
+        "chamadas": len(amostras),
+        "p50_ms": round(_percentil(amostras, 50), 3),
+        "p99_ms": round(_percentil(amostras, 99), 3),
+        "max_ms": round(max(amostras), 3),
+    }
+
+
+@contextmanager
+def ambiente_sem_display(tipo_missao="Harness"):
+    """Troca os módulos Tk usados por gui.interface por dublês e restaura ao sair."""
+    fake_tk = types.SimpleNamespace(
+        Canvas=CanvasGravador, Text=WidgetFalso, Toplevel=WidgetFalso, BooleanVar=WidgetFalso,
+        LEFT="left", RIGHT="right", TOP="top", BOTTOM="bottom",
+        END="end", NORMAL="normal", DISABLED="disabled",
+    )
+    fake_ttk = types.SimpleNamespace(
+        Style=WidgetFalso, Notebook=WidgetFalso, Frame=WidgetFalso, Label=WidgetFalso,
+        Button=WidgetFalso, Combobox=WidgetFalso, Progressbar=WidgetFalso,
+        Scrollbar=WidgetFalso, Spinbox=WidgetFalso, Entry=WidgetFalso, Checkbutton=WidgetFalso,
+    )
+    avisos = []
+    fake_messagebox = types.SimpleNamespace(
+        showinfo=lambda *args, **kwargs: avisos.append(("info",) + args),
+        showwarning=lambda *args, **kwargs: avisos.append(("aviso",) + args),
+        showerror=lambda *args, **kwargs: avisos.append(("erro",) + args),
+    )
+    fake_simpledialog = types.SimpleNamespace(askstring=lambda *args, **kwargs: tipo_missao)
+    fake_filedialog = types.SimpleNamespace(asksaveasfilename=lambda **kwargs: "", askopenfilename=lambda **kwargs: "")
+    fake_imagetk = types.SimpleNamespace(PhotoImage=lambda imagem: imagem)
+
+    substituicoes = {
+        "tk": fake_tk, "ttk": fake_ttk, "messagebox": fake_messagebox,
+        "simpledialog": fake_simpledialog, "filedialog": fake_filedialog, "ImageTk": fake_imagetk,
+    }
+    originais = {nome: getattr(interface, nome) for nome in substituicoes}
+    for nome, duble in substituicoes.items():
+        setattr(interface, nome, duble)
+    try:
+        yield avisos
+    finally:
+        for nome, original in originais.items():
+            setattr(interface, nome, original)
+
+
+def _canvases(app):
+    return [app.canvas, app.charts_canvas]
+
+
+def _itens_criados(app) -> int:
+    return sum(c.itens_criados for c in _canvases(app))
+
+
+def _aguardar_relatorios(root, app, limite_s=30.0):
+    """Roda os callbacks agendados até a fila de relatórios esvaziar."""
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < limite_s:
+        root.executar_pendentes()
+        if app._coleta_agendada is None: # Outros callbacks (ex.: tick do ambiente) se reagendam sempre
+            return
+        time.sleep(0.001)
+
+
+def executar_sessao(movimentos=200, missoes=2, seed=0) -> dict:
+    """Reproduz a sessão roteirizada e retorna o relatório de latência."""
+    rng = random.Random(seed)
+    random.seed(seed) # Telemetria e consumo de bateria usam o módulo random global
+    cronometro = Cronometro()
+    acoes = {}
+
+    with ambiente_sem_display() as avisos:
+        root = RootFalso()
+        app = interface.InterfaceDrone(root)
+        for nome in HANDLERS_MEDIDOS:
+            setattr(app, nome, cronometro.envolver(nome, getattr(app, nome)))
+        root.executar_pendentes() # Desenho inicial agendado
+
+        def acao(nome, funcao, *args):
+            itens_antes = _itens_criados(app)
+            inicio = time.perf_counter()
+            funcao(*args)
+            ms = (time.perf_counter() - inicio) * 1000
+            registro = acoes.setdefault(nome, {"tempos": [], "itens": []})
+            registro["tempos"].append(ms)
+            registro["itens"].append(_itens_criados(app) - itens_antes)
+
+        for _ in range(missoes):
+            for drone_id in list(app.drones):
+                app.drone_combobox.set(drone_id)
+                acao("trocar_drone", app.on_drone_select, None)
+                _aguardar_relatorios(root, app)
+
+                acao("iniciar_missao", app.iniciar_missao)
+                for _ in range(movimentos):
+                    if app.drone.missao_ativa is None:
+                        break # Bateria esgotada finaliza a missão
+                    app.drone.bateria = app.drone.initial_battery # Mantém a missão viva durante o roteiro
+                    dx, dy = rng.choice(DIRECOES)
+                    if not (0 <= app.drone.x + dx < interface.LARGURA_MAPA and 0 <= app.drone.y + dy < interface.ALTURA_MAPA):
+                        dx, dy = -dx, -dy
+                    acao("mover", app.mover_drone, dx, dy)
+                if app.drone.missao_ativa is not None:
+                    acao("finalizar_missao", app.finalizar_missao)
+                _aguardar_relatorios(root, app)
+
+            novo_mapa = interface.MAP_TYPES[(interface.MAP_TYPES.index(app.map_type) + 1) % len(interface.MAP_TYPES)]
+            app.map_combobox.set(novo_mapa)
+            acao("trocar_mapa", app.on_map_select, None)
+
+        app.gerador_relatorios.encerrar()
+
+    return {
+        "configuracao": {"movimentos": movimentos, "missoes_por_drone": missoes, "seed": seed,
+                         "canvas": [LARGURA_CANVAS, ALTURA_CANVAS]},
+        "handlers": {nome: _resumir(amostras) for nome, amostras in sorted(cronometro.amostras.items())},
+        "acoes": {
+            nome: dict(_resumir(r["tempos"]),
+                       itens_canvas_medio=round(sum(r["itens"]) / len(r["itens"]), 1),
+                       itens_canvas_max=max(r["itens"]))
+            for nome, r in acoes.items()
+        },
+        "dialogos": len(avisos),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede a latência dos handlers da interface sem display.")
+    parser.add_argument("--movimentos", type=int, default=200, help="movimentos por missão")
+    parser.add_argument("--missoes", type=int, default=2, help="missões por drone")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--orcamento-p99-ms", type=float, help="falha se o p99 de algum handler passar deste valor")
+    args = parser.parse_args(argv)
+
+    resultado = executar_sessao(args.movimentos, args.missoes, args.seed)
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
+    else:
+        print(texto)
+
+    if args.orcamento_p99_ms is not None:
+        estourados = [nome for nome, r in resultado["handlers"].items() if r["p99_ms"] > args.orcamento_p99_ms]
+        if estourados:
+            print(f"Orçamento de {args.orcamento_p99_ms} ms (p99) excedido em: {', '.join(estourados)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,26 @@
 # gui/interface.py
 import tkinter as tk
-from tkinter import simpledialog, messagebox, ttk
+from tkinter import simpledialog, messagebox, ttk, filedialog
 import random
 import time
 import math
 import os
+from datetime import datetime, timedelta
 from PIL import Image, ImageTk
 
 # IMPORTAR CLASSES DO CORE
 from core.drone import Drone
 from core.missao import Missao
 from core.lista_encadeada import ListaEncadeada
-from core.ponto_voo import PontoDeVoo, calcular_distancia 
+from core.ponto_voo import CATEGORIAS_POLUICAO, TABELA_CORES_POLUICAO, indice_categoria_poluicao
+from core.mapa_ambiental import MapaAmbiental, CacheMapas, URBANO_TYPE, RURAL_TYPE, MISTO_TYPE
+from core.hash_espacial import HashEspacial
+from core.ambiente_dinamico import AmbienteDinamico
+from core.telemetria import SERIES_TELEMETRIA
+from core.estimativa_bateria import estimar_autonomia
+from core.relatorio_assincrono import GeradorRelatoriosAssincrono
+from core.snapshot import salvar_snapshot, carregar_snapshot, ErroSnapshot
+from core.registro_missoes import REGISTRO_MISSOES
 
 # Configurações de Mapa e Células
 LARGURA_MAPA = 17 
@@ -22,9 +31,37 @@ MAP_TYPES = ["Urbano", "Rural", "Misto"]
 MAPA_URBANO_PATH = "1001562711.png" 
 MAPA_RURAL_PATH = "1001562713.png" 
 MAPA_MISTO_PATH = "1001562712.png" 
-URBANO_TYPE = "Urbano"
-RURAL_TYPE = "Rural" 
-MISTO_TYPE = "Misto" 
+DRONE_ICON_PATH = "drone.png"
+
+# Frota: base de decolagem, distância mínima de separação (células) e modelo dos drones adicionados
+BASE_X, BASE_Y = LARGURA_MAPA // 2, ALTURA_MAPA // 2
+DISTANCIA_SEPARACAO = 1.0
+MODELO_FROTA = "Frota Simulada"
+TIPO_MISSAO_FROTA = "Patrulha"
+
+# Cores das séries nos gráficos de telemetria
+CORES_GRAFICOS = ["#66BB6A", "#42A5F5", "#FFCA28", "#EF5350", "#AB47BC"]
+
+# Extensões de snapshot da sessão (a versão "z" é comprimida com zlib)
+EXTENSAO_SNAPSHOT = ".drnsnap"
+EXTENSAO_SNAPSHOT_COMPRIMIDO = ".drnsnapz"
+
+# Intervalo entre ticks do ambiente dinâmico (difusão/vento da poluição)
+INTERVALO_AMBIENTE_MS = 1000
+
+# Intervalo de leitura da fila de relatórios (~60 Hz)
+INTERVALO_COLETA_MS = 16
+
+# Opção do filtro de tipo na aba Relatórios que mostra todas as missões
+TODOS_OS_TIPOS = "Todos"
+
+# Filtro de período da aba Relatórios: janela até agora (None = sem limite)
+PERIODOS_RELATORIO = {
+    "Todo o período": None,
+    "Última hora": timedelta(hours=1),
+    "Últimas 24 h": timedelta(days=1),
+    "Últimos 7 dias": timedelta(days=7),
+}
 
 
 class InterfaceDrone:
@@ -64,18 +101,35 @@ class InterfaceDrone:
         }
         self.drone_selecionado_id = "DRN001"
         self.drone = self.drones[self.drone_selecionado_id]
+
+        # Relatórios calculados em segundo plano (resultados lidos via root.after)
+        self.gerador_relatorios = GeradorRelatoriosAssincrono()
+        self._coleta_agendada = None
+        self._relatorio_em_andamento = False
+        self.root.protocol("WM_DELETE_WINDOW", self.ao_fechar)
         
-        # Posição inicial do drone 
-        self.x, self.y = LARGURA_MAPA // 2, ALTURA_MAPA // 2 
+        # Posição inicial dos drones (cada Drone guarda a própria posição)
+        for drone in self.drones.values():
+            drone.x, drone.y = BASE_X, BASE_Y
+
+        # Drones em voo indexados por hash espacial (colisão e separação em O(n))
+        self.espaco_aereo = HashEspacial()
+        self.drones_em_conflito = set()
 
-        # Mapa de dados ambientais
+        # Mapa de dados ambientais (uma semente por tipo: voltar a um tipo reaproveita o cache)
         self.map_type = MAP_TYPES[0]
-        self.environmental_map_data = {}
+        self.map_seeds = {map_type: random.randrange(2**32) for map_type in MAP_TYPES}
+        self.cache_mapas = CacheMapas()
+        self.mapa = None
+        self.ambiente = None
+        self.itens_camada_aqi = {} # (c, r) -> id do retângulo da camada de AQI no canvas
         self._initialize_environmental_map(self.map_type)
 
         # Carregamento de Imagens
         self.background_images_pil = {}
         self.background_image_tk = None 
+        self.drone_icon_pil = None
+        self.drone_icon_cache = {} # tamanho -> PhotoImage (evita redimensionar a cada quadro)
         self._load_all_map_images()
 
 
@@ -115,6 +169,20 @@ class InterfaceDrone:
         self.on_canvas_resize(None)
         self.update_telemetry_display()
         self.exibir_relatorio(initial_load=True)
+        self.root.after(INTERVALO_AMBIENTE_MS, self._tick_ambiente)
+
+    def _tick_ambiente(self):
+        """
+        Avança o ambiente dinâmico um tick. Só as células cuja categoria de AQI
+        mudou têm o retângulo da camada recolorido (sem redesenhar o mapa).
+        """
+        alteradas = self.ambiente.passo()
+        for celula in alteradas:
+            item = self.itens_camada_aqi.get(celula)
+            if item is not None:
+                self.canvas.itemconfig(item, fill=self.mapa.cor(*celula))
+        self.ambiente_label.config(text=f"Ambiente: t={self.ambiente.tempo} | Vento: {self.ambiente.direcao_vento}")
+        self.root.after(INTERVALO_AMBIENTE_MS, self._tick_ambiente)
 
     def _load_all_map_images(self):
         """Carrega todas as imagens de mapa na memória PIL."""
@@ -133,6 +201,11 @@ class InterfaceDrone:
             except Exception as e:
                 print(f"ERRO: Não foi possível carregar a imagem {path}: {e}")
 
+        try:
+            self.drone_icon_pil = Image.open(DRONE_ICON_PATH)
+        except Exception:
+            self.drone_icon_pil = None # Usa o triângulo como ícone
+
     def _setup_simulacao_tab(self):
         # Frame do Canvas (Mapa)
         self.canvas_frame = ttk.Frame(self.tab_simulacao, padding=5, relief="raised")
@@ -165,6 +238,10 @@ class InterfaceDrone:
         ttk.Button(self.control_frame, text="Simulação Auto", command=self.simular_movimento_automatico).grid(row=0, column=4, padx=5, pady=5, sticky="ew")
 
 
+        # Snapshot da sessão (linha 1, nas laterais da navegação)
+        ttk.Button(self.control_frame, text="Salvar Sessão", command=self.salvar_sessao).grid(row=1, column=0, columnspan=2, padx=5, pady=5, sticky="ew")
+        ttk.Button(self.control_frame, text="Carregar Sessão", command=self.carregar_sessao).grid(row=1, column=4, padx=5, pady=5, sticky="ew")
+
         # Controles de Navegação (Centralizados)
         nav_frame = ttk.Frame(self.control_frame, style='TFrame')
         nav_frame.grid(row=1, column=2, columnspan=2, pady=10) # Centralizado
@@ -175,6 +252,16 @@ class InterfaceDrone:
         ttk.Button(nav_frame, text="→", command=lambda: self.mover_drone(1, 0), style='Arrow.TButton').grid(row=1, column=2)
         ttk.Button(nav_frame, text="↓", command=lambda: self.mover_drone(0, 1), style='Arrow.TButton').grid(row=2, column=1)
 
+        # Alertas de separação da frota
+        self.separacao_label = ttk.Label(self.control_frame, text="", font=('Inter', 10, 'bold'), background='#34495e', foreground='#FFCA28')
+        self.separacao_label.grid(row=2, column=0, columnspan=5, sticky="w", padx=5)
+
+        # Ambiente dinâmico: camada de AQI opcional e estado do vento
+        self.mostrar_camada_aqi = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.control_frame, text="Camada AQI", variable=self.mostrar_camada_aqi, command=self.desenhar_mapa).grid(row=3, column=0, columnspan=2, sticky="w", padx=5)
+        self.ambiente_label = ttk.Label(self.control_frame, text="", font=('Inter', 10), background='#34495e', foreground='#E0E0E0')
+        self.ambiente_label.grid(row=3, column=2, columnspan=3, sticky="w", padx=5)
+
 
     def _setup_telemetria_tab(self):
         # Configuração da Aba 2: Telemetria & Status
@@ -185,6 +272,8 @@ class InterfaceDrone:
         self.drone_combobox.set(self.drone_selecionado_id)
         self.drone_combobox.bind("<<ComboboxSelected>>", self.on_drone_select)
         self.drone_combobox.pack(side=tk.LEFT, padx=10)
+        ttk.Button(drone_select_frame, text="Adicionar Drones", command=self.adicionar_drones).pack(side=tk.LEFT, padx=5)
+        ttk.Button(drone_select_frame, text="Lançar Frota", command=self.lancar_frota).pack(side=tk.LEFT, padx=5)
         
         battery_panel = ttk.Frame(self.tab_telemetria, padding=10, relief="groove")
         battery_panel.pack(fill='x', pady=10)
@@ -200,7 +289,7 @@ class InterfaceDrone:
         ttk.Label(telemetry_grid, text="Dados de Telemetria (Último Ponto)", font=('Inter', 14, 'bold'), background='#34495e', foreground='white').grid(row=0, column=0, columnspan=2, pady=10)
         
         self.telemetry_labels = {}
-        telemetry_fields = ["Altitude", "Velocidade", "Vento", "Carga", "Câmera", "Fotos", "Coordenadas", "Tipo de Área", "Poluição (AQI)"]
+        telemetry_fields = ["Altitude", "Velocidade", "Vento", "Carga", "Câmera", "Fotos", "Coordenadas", "Tipo de Área", "Poluição (AQI)", "Autonomia (passos)", "Retorno à Base"]
         for i, field in enumerate(telemetry_fields):
             row = i // 2 + 1
             col = i % 2
@@ -211,6 +300,13 @@ class InterfaceDrone:
             self.telemetry_labels[field] = label_value
             telemetry_grid.grid_columnconfigure(col*2, weight=1)
 
+        # Painel de Gráficos (séries da missão em buffers circulares)
+        charts_panel = ttk.Frame(self.tab_telemetria, padding=5, relief="groove")
+        charts_panel.pack(fill='both', expand=True, pady=10)
+        self.charts_canvas = tk.Canvas(charts_panel, bg="#2c3e50", height=260, bd=0, highlightthickness=0)
+        self.charts_canvas.pack(expand=True, fill='both')
+        self.charts_canvas.bind("<Configure>", lambda event: self.desenhar_graficos_telemetria())
+
     def _setup_relatorios_tab(self):
         # Configuração da Aba 3: Relatórios & Histórico
         ttk.Label(self.tab_relatorios, text="Histórico de Missões Finalizadas", font=('Inter', 16, 'bold'), background='#34495e', foreground='white').pack(pady=10)
@@ -225,49 +321,60 @@ class InterfaceDrone:
         scrollbar.pack(side=tk.RIGHT, fill='y')
         self.report_text.config(yscrollcommand=scrollbar.set)
         
-        ttk.Button(self.tab_relatorios, text="Atualizar Relatórios", command=self.exibir_relatorio).pack(pady=5)
+        progress_frame = ttk.Frame(self.tab_relatorios, style='TFrame')
+        progress_frame.pack(fill='x', pady=5)
+        self.report_progressbar = ttk.Progressbar(progress_frame, orient="horizontal", mode="determinate", style="green.Horizontal.TProgressbar")
+        self.report_progressbar.pack(side=tk.LEFT, expand=True, fill='x', padx=5)
+        self.report_status_label = ttk.Label(progress_frame, text="", font=('Inter', 10), background='#34495e', foreground='#E0E0E0')
+        self.report_status_label.pack(side=tk.LEFT, padx=5)
+
+        # Seletor de intervalo: estatísticas entre dois pontos ou numa janela de tempo
+        range_frame = ttk.Frame(self.tab_relatorios, style='TFrame')
+        range_frame.pack(fill='x', pady=5)
+        label_style = {'font': ('Inter', 10, 'bold'), 'background': '#34495e', 'foreground': '#E0E0E0'}
+        ttk.Label(range_frame, text="Tipo:", **label_style).pack(side=tk.LEFT, padx=5)
+        self.report_type_combobox = ttk.Combobox(range_frame, values=[TODOS_OS_TIPOS], state="readonly", width=12)
+        self.report_type_combobox.set(TODOS_OS_TIPOS)
+        self.report_type_combobox.pack(side=tk.LEFT)
+        self.report_type_combobox.bind("<<ComboboxSelected>>", lambda event: self.exibir_relatorio())
+        ttk.Label(range_frame, text="Período:", **label_style).pack(side=tk.LEFT, padx=5)
+        self.report_period_combobox = ttk.Combobox(range_frame, values=list(PERIODOS_RELATORIO), state="readonly", width=14)
+        self.report_period_combobox.set(next(iter(PERIODOS_RELATORIO)))
+        self.report_period_combobox.pack(side=tk.LEFT)
+        self.report_period_combobox.bind("<<ComboboxSelected>>", lambda event: self.exibir_relatorio())
+        ttk.Label(range_frame, text="Missão nº:", **label_style).pack(side=tk.LEFT, padx=5)
+        self.range_mission_spinbox = ttk.Spinbox(range_frame, from_=1, to=9999, width=5)
+        self.range_mission_spinbox.set(1)
+        self.range_mission_spinbox.pack(side=tk.LEFT)
+        self.range_mode_combobox = ttk.Combobox(range_frame, values=["Pontos", "Tempo (s)"], state="readonly", width=10)
+        self.range_mode_combobox.set("Pontos")
+        self.range_mode_combobox.pack(side=tk.LEFT, padx=5)
+        ttk.Label(range_frame, text="De:", **label_style).pack(side=tk.LEFT, padx=5)
+        self.range_start_entry = ttk.Entry(range_frame, width=8)
+        self.range_start_entry.insert(0, "0")
+        self.range_start_entry.pack(side=tk.LEFT)
+        ttk.Label(range_frame, text="Até:", **label_style).pack(side=tk.LEFT, padx=5)
+        self.range_end_entry = ttk.Entry(range_frame, width=8)
+        self.range_end_entry.insert(0, "10")
+        self.range_end_entry.pack(side=tk.LEFT)
+
+        buttons_frame = ttk.Frame(self.tab_relatorios, style='TFrame')
+        buttons_frame.pack(pady=5)
+        ttk.Button(buttons_frame, text="Consultar Intervalo", command=self.consultar_intervalo).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Atualizar Relatórios", command=self.exibir_relatorio).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Excluir Missão", command=self.excluir_missao).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Cancelar", command=self.cancelar_relatorios).pack(side=tk.LEFT, padx=5)
 
 
     # Lógica do mapa e geração de dados
     def _initialize_environmental_map(self, map_type):
-        """Inicializa os dados ambientais para cada célula do mapa baseado no tipo."""
-        map_data = {}
-        areas_possiveis = ["urbana", "residencial", "industrial", "rural", "mata", "zona de risco"]
-        
-        if map_type == URBANO_TYPE:
-            weights = [40, 20, 30, 5, 0, 5] 
-        elif map_type == RURAL_TYPE:
-            weights = [5, 5, 0, 50, 35, 5] 
-        else: # MISTO_TYPE
-            weights = [15, 15, 15, 20, 20, 15] 
-
-        for r in range(ALTURA_MAPA):
-            for c in range(LARGURA_MAPA):
-                area = random.choices(areas_possiveis, weights=weights, k=1)[0]
-                
-                # Definir base de poluição e densidade com base no tipo de área
-                if area == "industrial":
-                    poluicao_base = random.randint(150, 350)
-                    densidade_base = random.randint(500, 1500)
-                elif area == "mata":
-                    poluicao_base = random.randint(10, 50)
-                    densidade_base = random.randint(1, 10)
-                else:
-                    poluicao_base = random.randint(50, 150)
-                    densidade_base = random.randint(50, 500)
-
-                env_data = {
-                    "tipo_area": area,
-                    "densidade_populacional": densidade_base + random.randint(-50, 50),
-                    "presenca_areas_verdes": random.randint(0, 100),
-                    "indice_poluicao_ar": poluicao_base + random.randint(-10, 10),
-                    "presenca_construcoes_altas": area in ["urbana", "industrial"],
-                    "sinal_gps": random.choice(["forte", "fraco", "perdido"]) if area == "zona de risco" else "forte",
-                    "intensidade_ruido": random.randint(30, 100)
-                }
-                map_data[(c, r)] = env_data
-        
-        self.environmental_map_data = map_data
+        """Obtém do cache (ou gera) o mapa do tipo informado, com suas camadas derivadas."""
+        self._definir_mapa(self.cache_mapas.obter(map_type, self.map_seeds[map_type], LARGURA_MAPA, ALTURA_MAPA))
+
+    def _definir_mapa(self, mapa):
+        """Torna 'mapa' o mapa atual; a poluição dele passa a evoluir no tempo."""
+        self.mapa = mapa
+        self.ambiente = AmbienteDinamico(mapa)
         
     def on_map_select(self, event):
         """Atualiza o mapa quando o usuário seleciona um novo tipo."""
@@ -277,10 +384,14 @@ class InterfaceDrone:
             self._initialize_environmental_map(new_type)
             self.desenhar_mapa()
             messagebox.showinfo("Novo Mapa", f"Mapa '{new_type}' carregado. Inicie uma nova missão.")
-            # Reposiciona o drone
-            self.x, self.y = LARGURA_MAPA // 2, ALTURA_MAPA // 2
-            self.drone.missao_ativa = None
-            self.drone.bateria = self.drone.initial_battery
+            # Reposiciona a frota: missões em andamento no mapa antigo são descartadas
+            for drone in self.drones.values():
+                self._pousar(drone)
+                drone.x, drone.y = BASE_X, BASE_Y
+                drone.cancelar_missao()
+                drone.bateria = drone.initial_battery
+            self._verificar_separacao()
+            self.desenhar_mapa()
             self.update_telemetry_display()
 
 
@@ -323,6 +434,12 @@ class InterfaceDrone:
             outline_color = "#BDC3C7"
 
 
+        # Cor da primeira visita a cada célula: categoria guardada ao registrar o ponto + tabela de cores
+        cores_visitadas = {}
+        if self.drone.missao_ativa:
+            cores_visitadas = {celula: TABELA_CORES_POLUICAO[codigo]
+                               for celula, codigo in self.drone.missao_ativa.celulas_visitadas().items()}
+
         # 2. Desenha as células e os pontos visitados (coloridos pela poluição)
         for linha in range(ALTURA_MAPA):
             for coluna in range(LARGURA_MAPA):
@@ -333,24 +450,30 @@ class InterfaceDrone:
 
                 cor_celula = default_cell_color
 
-                if self.drone.missao_ativa:
-                    pontos = self.drone.missao_ativa.pontos_voo.to_list()
-                    for ponto in pontos:
-                        if ponto.coordenadas == (coluna, linha):
-                            _, cor_poluicao = ponto.categoria_poluicao()
-                            
-                            if is_textured_map:
-                                # Desenha um overlay semi-transparente sobre a imagem de fundo
-                                self.canvas.create_rectangle(x0, y0, x1, y1, fill=cor_poluicao, stipple='gray50', outline=outline_color, width=1)
-                                cor_celula = "" # Evita redesenhar o retângulo abaixo
-                            else:
-                                cor_celula = cor_poluicao 
-                            break
+                cor_poluicao = cores_visitadas.get((coluna, linha))
+                if cor_poluicao is not None:
+                    if is_textured_map:
+                        # Desenha um overlay semi-transparente sobre a imagem de fundo
+                        self.canvas.create_rectangle(x0, y0, x1, y1, fill=cor_poluicao, stipple='gray50', outline=outline_color, width=1)
+                        cor_celula = "" # Evita redesenhar o retângulo abaixo
+                    else:
+                        cor_celula = cor_poluicao 
                     
                 # Desenha a célula padrão (se não for o mapa de fundo e não foi desenhado um overlay)
                 if cor_celula != "": 
                     self.canvas.create_rectangle(x0, y0, x1, y1, fill=cor_celula, outline=outline_color, width=1) 
 
+        # Camada de AQI do ambiente (cores lidas da tabela; _tick_ambiente recolore só o que mudar)
+        self.itens_camada_aqi = {}
+        if self.mostrar_camada_aqi.get():
+            for linha in range(ALTURA_MAPA):
+                for coluna in range(LARGURA_MAPA):
+                    x0 = offset_x + coluna * self.current_cell_size
+                    y0 = offset_y + linha * self.current_cell_size
+                    self.itens_camada_aqi[(coluna, linha)] = self.canvas.create_rectangle(
+                        x0, y0, x0 + self.current_cell_size, y0 + self.current_cell_size,
+                        fill=self.mapa.cor(coluna, linha), stipple='gray25', outline="", tags="camada_aqi")
+
         # 3. Desenha o caminho percorrido (Lista Encadeada)
         if self.drone.missao_ativa and not self.drone.missao_ativa.pontos_voo.esta_vazia():
             path_coords = []
@@ -364,65 +487,243 @@ class InterfaceDrone:
                 self.canvas.create_line(path_coords, fill="#3F51B5", width=3, smooth=True, tags="drone_path")
                 self.canvas.tag_lower("drone_path")
 
-        # 4. 🚁 DESENHAR O DRONE (IMAGEM)
-        drone_x_center = offset_x + self.x * self.current_cell_size + self.current_cell_size / 2
-        drone_y_center = offset_y + self.y * self.current_cell_size + self.current_cell_size / 2
-        
-        try:
-            # ⚠️ Tenta carregar "drone.png" (o ícone real)
-            caminho_imagem = "drone.png"
-            
-            if not os.path.exists(caminho_imagem):
-                # Se "drone.png" não existe, o código levanta um erro para cair no 'except'
-                raise FileNotFoundError(f"Imagem do drone ('{caminho_imagem}') não encontrada.")
-
-            # Carrega e redimensiona
-            tamanho_icone = int(self.current_cell_size * 0.8)
-            img_original = Image.open(caminho_imagem)
-            img_redimensionada = img_original.resize((tamanho_icone, tamanho_icone), Image.Resampling.LANCZOS)
-            
-            self.drone_icon_img = ImageTk.PhotoImage(img_redimensionada)
-            self.canvas.create_image(drone_x_center, drone_y_center, image=self.drone_icon_img, tags="drone_icon")
-            
-        except Exception as e:
-            # Fallback para o triângulo/polígono se o arquivo não for encontrado
-            drone_size = self.current_cell_size * 0.4
-            pontos_drone = [
-                drone_x_center, drone_y_center - drone_size * 0.8,  
-                drone_x_center + drone_size * 0.6, drone_y_center + drone_size * 0.5, 
-                drone_x_center - drone_size * 0.6, drone_y_center + drone_size * 0.5  
-            ]
-            # Desenha o fallback (triângulo vermelho)
-            self.canvas.create_polygon(pontos_drone, fill="#FF0000", outline="#8B0000", width=1, tags="drone_icon")
-            self.canvas.create_oval(drone_x_center - drone_size/4, drone_y_center - drone_size/4, drone_x_center + drone_size/4, drone_y_center + drone_size/4, fill="#FFFFFF", tags="drone_center")
+        # 4. 🚁 DESENHAR OS DRONES (toda a frota em voo + o selecionado)
+        tamanho_icone = max(1, int(self.current_cell_size * 0.8))
+        icone = self._icone_drone(tamanho_icone)
+        visiveis = [d for d in self.drones.values() if d.missao_ativa is not None]
+        if self.drone not in visiveis:
+            visiveis.append(self.drone)
+
+        for drone in visiveis:
+            drone_x_center = offset_x + drone.x * self.current_cell_size + self.current_cell_size / 2
+            drone_y_center = offset_y + drone.y * self.current_cell_size + self.current_cell_size / 2
+            raio = self.current_cell_size * 0.45
+
+            if drone is self.drone:
+                self.canvas.create_oval(drone_x_center - raio, drone_y_center - raio, drone_x_center + raio, drone_y_center + raio, outline="#FFEB3B", width=2, tags="drone_icon")
+            if drone in self.drones_em_conflito:
+                self.canvas.create_oval(drone_x_center - raio, drone_y_center - raio, drone_x_center + raio, drone_y_center + raio, outline="#FF0000", width=3, dash=(4, 2), tags="drone_icon")
+
+            if icone is not None:
+                self.canvas.create_image(drone_x_center, drone_y_center, image=icone, tags="drone_icon")
+            else:
+                # Fallback para o triângulo/polígono se o arquivo não for encontrado
+                drone_size = self.current_cell_size * 0.4
+                pontos_drone = [
+                    drone_x_center, drone_y_center - drone_size * 0.8,  
+                    drone_x_center + drone_size * 0.6, drone_y_center + drone_size * 0.5, 
+                    drone_x_center - drone_size * 0.6, drone_y_center + drone_size * 0.5  
+                ]
+                self.canvas.create_polygon(pontos_drone, fill="#FF0000", outline="#8B0000", width=1, tags="drone_icon")
+                self.canvas.create_oval(drone_x_center - drone_size/4, drone_y_center - drone_size/4, drone_x_center + drone_size/4, drone_y_center + drone_size/4, fill="#FFFFFF", tags="drone_center")
         
         self.canvas.tag_raise("drone_icon")
         self.canvas.tag_raise("drone_center")
 
-    
+    def _icone_drone(self, tamanho):
+        """Retorna o ícone do drone redimensionado (em cache por tamanho) ou None se indisponível."""
+        if self.drone_icon_pil is None:
+            return None
+        icone = self.drone_icon_cache.get(tamanho)
+        if icone is None:
+            img_redimensionada = self.drone_icon_pil.resize((tamanho, tamanho), Image.Resampling.LANCZOS)
+            icone = ImageTk.PhotoImage(img_redimensionada)
+            self.drone_icon_cache = {tamanho: icone} # Só o tamanho atual do canvas interessa
+        return icone
+
+    # Lógica da Frota (posição e espaço aéreo compartilhado)
+    def _celula_livre_proxima(self, x, y, separacao: float = 0.0):
+        """
+        Célula mais próxima de (x, y), em anéis crescentes, sem drone em voo a até
+        'separacao' células (0 = basta a célula estar livre); None se não houver.
+        """
+        for raio in range(max(LARGURA_MAPA, ALTURA_MAPA)):
+            for c in range(x - raio, x + raio + 1):
+                for r in range(y - raio, y + raio + 1):
+                    if max(abs(c - x), abs(r - y)) != raio:
+                        continue
+                    if 0 <= c < LARGURA_MAPA and 0 <= r < ALTURA_MAPA and not self.espaco_aereo.vizinhos(c, r, separacao):
+                        return c, r
+        return None
+
+    def _decolar(self, drone, exigir_separacao: bool = False) -> bool:
+        """
+        Posiciona o drone na célula mais próxima da base que respeita DISTANCIA_SEPARACAO
+        e registra o ponto inicial. Sem essa célula, usa a livre mais próxima, a menos
+        que a separação seja exigida (lançamento da frota).
+        """
+        celula = self._celula_livre_proxima(BASE_X, BASE_Y, DISTANCIA_SEPARACAO)
+        if celula is None and not exigir_separacao:
+            celula = self._celula_livre_proxima(BASE_X, BASE_Y)
+        if celula is None:
+            return False
+        drone.x, drone.y = celula
+        drone.registrar_ponto_voo(drone.x, drone.y, self.mapa.amostrar(*celula))
+        self.espaco_aereo.inserir(drone, drone.x, drone.y)
+        return True
+
+    def _pousar(self, drone):
+        self.espaco_aereo.remover(drone)
+
+    def _mover(self, drone, dx, dy):
+        """
+        Move um drone em voo uma célula. Retorna None em caso de sucesso,
+        "fora" se sair do mapa ou "ocupada" se outro drone estiver na célula (colisão).
+        """
+        novo_x = drone.x + dx
+        novo_y = drone.y + dy
+        if not (0 <= novo_x < LARGURA_MAPA and 0 <= novo_y < ALTURA_MAPA):
+            return "fora"
+        if any(outro is not drone for outro in self.espaco_aereo.ocupantes(novo_x, novo_y)):
+            return "ocupada"
+
+        env_data = self.mapa.amostrar(novo_x, novo_y)
+        drone.registrar_ponto_voo(novo_x, novo_y, env_data)
+        self.espaco_aereo.mover(drone, novo_x, novo_y)
+        return None
+
+    def _verificar_separacao(self):
+        """Atualiza os alertas de drones mais próximos que DISTANCIA_SEPARACAO."""
+        pares = self.espaco_aereo.pares_proximos(DISTANCIA_SEPARACAO)
+        self.drones_em_conflito = {d for a, b, _ in pares for d in (a, b)}
+        if pares:
+            exemplos = ", ".join(f"{a.identificador}–{b.identificador}" for a, b, _ in pares[:3])
+            extra = f" (+{len(pares) - 3})" if len(pares) > 3 else ""
+            self.separacao_label.config(text=f"⚠️ Separação mínima violada: {exemplos}{extra}")
+        else:
+            self.separacao_label.config(text="")
+        return pares
+
+    def adicionar_drones(self):
+        """Adiciona drones à frota (parados na base até o lançamento)."""
+        quantidade = simpledialog.askinteger("Adicionar Drones", "Quantos drones adicionar?", parent=self.root, minvalue=1, maxvalue=500)
+        if not quantidade:
+            return
+        numero = len(self.drones)
+        for _ in range(quantidade):
+            numero += 1
+            while f"DRN{numero:03d}" in self.drones:
+                numero += 1
+            identificador = f"DRN{numero:03d}"
+            drone = Drone(identificador, MODELO_FROTA)
+            drone.x, drone.y = BASE_X, BASE_Y
+            self.drones[identificador] = drone
+        self.drone_combobox.config(values=list(self.drones.keys()))
+        messagebox.showinfo("Frota", f"{quantidade} drone(s) adicionado(s). Frota com {len(self.drones)} drones.")
+
+    def lancar_frota(self):
+        """
+        Inicia uma missão de patrulha para cada drone parado, em células separadas por
+        DISTANCIA_SEPARACAO; para quando o mapa não tiver mais células assim.
+        """
+        parados = [drone for drone in self.drones.values() if drone.missao_ativa is None]
+        lancados = 0
+        for drone in parados:
+            drone.iniciar_missao(TIPO_MISSAO_FROTA)
+            if not self._decolar(drone, exigir_separacao=True):
+                drone.cancelar_missao() # Mapa lotado
+                break
+            lancados += 1
+        self._verificar_separacao()
+        self.desenhar_mapa()
+        self.update_telemetry_display()
+        texto = f"{lancados} drone(s) lançado(s). Use 'Simulação Auto' para movê-los juntos."
+        if lancados < len(parados):
+            texto += f"\n{len(parados) - lancados} drone(s) ficaram na base: não há mais células com a separação mínima."
+        messagebox.showinfo("Frota", texto)
+
     # Lógica de Controle
     def iniciar_missao(self):
-        response = self.drone.iniciar_missao("")
-        if "⚠️" in response:
-            messagebox.showwarning("Aviso", response)
+        if self.drone.missao_ativa is not None:
+            messagebox.showwarning("Aviso", "⚠️ Já existe uma missão em andamento. Finalize antes de iniciar outra.")
             return
 
         tipo = simpledialog.askstring("Tipo de Missão", "Digite o tipo da missão:", parent=self.root)
         if not tipo:
-            self.drone.missao_ativa = None 
             return
 
+        # O tipo é conhecido antes da criação: a missão entra no registro já indexada por tipo
         self.drone.iniciar_missao(tipo)
-        self.x, self.y = LARGURA_MAPA // 2, ALTURA_MAPA // 2 
         
-        # Registro do Ponto Inicial
-        env_data_start = self.environmental_map_data.get((self.x, self.y), {})
-        self.drone.registrar_ponto_voo(self.x, self.y, env_data_start) 
+        # Registro do Ponto Inicial (célula livre mais próxima da base)
+        if not self._decolar(self.drone):
+            self.drone.cancelar_missao()
+            messagebox.showwarning("Espaço Aéreo", "Não há célula livre para decolagem.")
+            return
+        self._verificar_separacao()
         
         self.desenhar_mapa()
         self.update_telemetry_display()
         messagebox.showinfo("Sucesso", f"Missão '{tipo}' iniciada com sucesso.")
 
+    def salvar_sessao(self):
+        """Grava drones, missões, posição e mapa atuais em um arquivo de snapshot."""
+        caminho = filedialog.asksaveasfilename(
+            parent=self.root, title="Salvar Sessão", defaultextension=EXTENSAO_SNAPSHOT,
+            filetypes=[("Snapshot", f"*{EXTENSAO_SNAPSHOT}"), ("Snapshot comprimido", f"*{EXTENSAO_SNAPSHOT_COMPRIMIDO}")])
+        if not caminho:
+            return
+
+        sessao = {
+            "drones": self.drones,
+            "drone_selecionado_id": self.drone_selecionado_id,
+            "map_type": self.map_type,
+            "environmental_map_data": self.mapa.dados_atuais(),
+            "map_seeds": self.map_seeds,
+            "poluicao_base": self.mapa.poluicao_base,
+            "estado_ambiente": self.ambiente.estado(),
+        }
+        try:
+            salvar_snapshot(caminho, sessao, comprimir=caminho.endswith(EXTENSAO_SNAPSHOT_COMPRIMIDO))
+        except OSError as e:
+            messagebox.showerror("Erro", f"Não foi possível salvar a sessão: {e}")
+            return
+        messagebox.showinfo("Sessão Salva", f"Sessão salva em '{os.path.basename(caminho)}'.")
+
+    def carregar_sessao(self):
+        """Restaura uma sessão salva por salvar_sessao."""
+        caminho = filedialog.askopenfilename(
+            parent=self.root, title="Carregar Sessão",
+            filetypes=[("Snapshot", f"*{EXTENSAO_SNAPSHOT} *{EXTENSAO_SNAPSHOT_COMPRIMIDO}"), ("Todos os arquivos", "*")])
+        if not caminho:
+            return
+
+        try:
+            sessao = carregar_snapshot(caminho, posicao_padrao=(BASE_X, BASE_Y))
+        except (OSError, ErroSnapshot) as e:
+            messagebox.showerror("Erro", f"Não foi possível carregar a sessão: {e}")
+            return
+
+        self.gerador_relatorios.cancelar()
+        # Reindexa antes de adotar os drones: a sessão atual só é trocada com o registro já consistente
+        REGISTRO_MISSOES.reconstruir(sessao["drones"].values())
+        self.drones = sessao["drones"]
+        self.drone_selecionado_id = sessao["drone_selecionado_id"]
+        self.drone = self.drones[self.drone_selecionado_id]
+        self.espaco_aereo = HashEspacial()
+        for drone in self.drones.values():
+            if drone.missao_ativa is not None:
+                self.espaco_aereo.inserir(drone, drone.x, drone.y)
+        self._verificar_separacao()
+        self.map_type = sessao["map_type"]
+        if sessao["map_seeds"]:
+            self.map_seeds.update(sessao["map_seeds"])
+        # O mapa restaurado entra no cache sob a semente do tipo: trocar de mapa e voltar o reaproveita
+        mapa = MapaAmbiental(self.map_type, LARGURA_MAPA, ALTURA_MAPA, sessao["environmental_map_data"],
+                             seed=self.map_seeds[self.map_type], poluicao_base=sessao["poluicao_base"])
+        self.cache_mapas.inserir(mapa)
+        self._definir_mapa(mapa)
+        if sessao["estado_ambiente"] is not None:
+            self.ambiente.restaurar_estado(sessao["estado_ambiente"])
+
+        self.drone_combobox.config(values=list(self.drones.keys()))
+        self.drone_combobox.set(self.drone_selecionado_id)
+        self.map_combobox.set(self.map_type)
+        self.desenhar_mapa()
+        self.update_telemetry_display()
+        self.exibir_relatorio()
+        messagebox.showinfo("Sessão Carregada", f"Sessão '{os.path.basename(caminho)}' restaurada.")
+
     def mover_drone(self, dx, dy):
         if self.drone.missao_ativa is None:
             messagebox.showwarning("Erro", "Inicie uma missão primeiro!")
@@ -433,58 +734,67 @@ class InterfaceDrone:
             self.finalizar_missao()
             return
 
-        novo_x = self.x + dx
-        novo_y = self.y + dy
-
-        if 0 <= novo_x < LARGURA_MAPA and 0 <= novo_y < ALTURA_MAPA:
-            self.x = novo_x
-            self.y = novo_y
-            
-            env_data = self.environmental_map_data.get((self.x, self.y), {})
-            self.drone.registrar_ponto_voo(self.x, self.y, env_data) 
+        resultado = self._mover(self.drone, dx, dy)
+        if resultado is None:
+            self._verificar_separacao()
             self.desenhar_mapa()
             self.update_telemetry_display()
+        elif resultado == "ocupada":
+            messagebox.showwarning("Colisão evitada", "Outro drone ocupa essa célula.")
         else:
             messagebox.showwarning("Movimento inválido", "O drone não pode sair do mapa.")
 
     def simular_movimento_automatico(self):
-        if self.drone.missao_ativa is None:
+        """Move todos os drones em voo ao mesmo tempo, um passo aleatório por tick."""
+        if not any(d.missao_ativa for d in self.drones.values()):
             messagebox.showwarning("Erro", "Inicie uma missão primeiro!")
             return
         
         passos = 15
+        pousos_bateria = []
         
         def _auto_move_step(step_count):
-            if step_count >= passos or self.drone.bateria <= 0:
-                if self.drone.bateria <= 0:
-                    messagebox.showerror("Bateria Esgotada", "A simulação automática foi interrompida: bateria esgotada!")
-                    self.finalizar_missao()
+            em_voo = [d for d in self.drones.values() if d.missao_ativa is not None]
+            if step_count >= passos or not em_voo:
+                if pousos_bateria:
+                    messagebox.showerror("Bateria Esgotada", f"Pousaram por bateria esgotada: {', '.join(pousos_bateria)}")
                 else:
                     messagebox.showinfo("Simulação Concluída", "A simulação automática terminou os passos definidos.")
                 return
 
-            # Simula um movimento
+            # Simula um movimento para cada drone da frota
             direcoes = [(0, -1), (0, 1), (-1, 0), (1, 0)] 
-            direcao = random.choice(direcoes)
-            
-            novo_x = self.x + direcao[0]
-            novo_y = self.y + direcao[1]
-
-            if 0 <= novo_x < LARGURA_MAPA and 0 <= novo_y < ALTURA_MAPA:
-                self.x = novo_x
-                self.y = novo_y
-                env_data = self.environmental_map_data.get((self.x, self.y), {})
-                self.drone.registrar_ponto_voo(self.x, self.y, env_data) 
-                self.desenhar_mapa()
-                self.update_telemetry_display()
-                self.root.after(300, lambda: _auto_move_step(step_count + 1)) 
-            else:
-                _auto_move_step(step_count + 1)
+            for drone in em_voo:
+                if drone.bateria <= 0:
+                    self._encerrar_missao(drone)
+                    self._pousar(drone)
+                    pousos_bateria.append(drone.identificador)
+                    if drone is self.drone:
+                        self.exibir_relatorio()
+                    continue
+                direcao = random.choice(direcoes)
+                self._mover(drone, *direcao) # Movimentos para fora do mapa ou células ocupadas são ignorados
+
+            self._verificar_separacao()
+            self.desenhar_mapa()
+            self.update_telemetry_display()
+            self.root.after(300, lambda: _auto_move_step(step_count + 1)) 
 
         _auto_move_step(0)
 
+    def _encerrar_missao(self, drone):
+        """Finaliza a missão do drone e agenda o arquivamento dela fora da thread da interface."""
+        missao = drone.missao_ativa
+        response = drone.finalizar_missao()
+        if missao is not None:
+            self.gerador_relatorios.arquivar(missao)
+            self._agendar_coleta()
+        return response
+
     def finalizar_missao(self):
-        response = self.drone.finalizar_missao()
+        response = self._encerrar_missao(self.drone)
+        self._pousar(self.drone)
+        self._verificar_separacao()
         messagebox.showinfo("Missão Finalizada", response)
         self.desenhar_mapa()
         self.update_telemetry_display()
@@ -517,38 +827,192 @@ class InterfaceDrone:
             self.telemetry_labels["Câmera"].config(text=f"{last_ponto.status_camera}")
             self.telemetry_labels["Fotos"].config(text=f"{last_ponto.num_fotos_registradas}")
             self.telemetry_labels["Tipo de Área"].config(text=last_ponto.tipo_area.title())
+
+            # Estimativa Monte Carlo da autonomia (base = ponto inicial da missão)
+            base = current_mission.pontos_voo.inicio.dado.coordenadas
+            estimativa = estimar_autonomia(current_drone_obj.bateria, (current_drone_obj.x, current_drone_obj.y), base=base)
+            passos = estimativa["passos"]
+            self.telemetry_labels["Autonomia (passos)"].config(text=f"{passos[50]:.0f} (p5 {passos[5]:.0f} – p95 {passos[95]:.0f})")
+            status_retorno = "Viável" if estimativa["retorno_viavel"] else "EM RISCO"
+            self.telemetry_labels["Retorno à Base"].config(text=f"{status_retorno} ({estimativa['passos_necessarios']} passos, {estimativa['probabilidade_retorno']:.0%})")
             
         else:
             for field in self.telemetry_labels:
                 self.telemetry_labels[field].config(text="N/A")
 
+        self.desenhar_graficos_telemetria()
+
+    def desenhar_graficos_telemetria(self):
+        """
+        Desenha as séries da missão ativa (uma faixa por série).
+        Os valores passam pelo redutor min/max, então o número de itens
+        criados no canvas depende da largura em pixels, não do tamanho da missão.
+        """
+        self.charts_canvas.delete("grafico")
+
+        largura = self.charts_canvas.winfo_width()
+        altura = self.charts_canvas.winfo_height()
+        missao = self.drone.missao_ativa
+        if largura <= 1 or altura <= 1:
+            return
+        if not missao or missao.pontos_voo.esta_vazia():
+            self.charts_canvas.create_text(largura / 2, altura / 2, text="Sem dados de telemetria", fill="#E0E0E0", font=('Inter', 10), tags="grafico")
+            return
+
+        margem_esq = 120
+        largura_util = max(1, largura - margem_esq - 10)
+        altura_faixa = altura / len(SERIES_TELEMETRIA)
+
+        for i, nome in enumerate(SERIES_TELEMETRIA):
+            y_topo = i * altura_faixa + 4
+            y_base = (i + 1) * altura_faixa - 4
+            buffer = missao.telemetria.buffers[nome]
+            pontos = missao.telemetria.serie_reduzida(nome, largura_util)
+
+            self.charts_canvas.create_text(6, (y_topo + y_base) / 2, text=f"{nome}\n{buffer.ultimo():.1f}", anchor="w", fill="#E0E0E0", font=('Inter', 8, 'bold'), tags="grafico")
+            self.charts_canvas.create_line(margem_esq, y_base, largura - 10, y_base, fill="#555555", tags="grafico")
+            if len(pontos) < 2:
+                continue
+
+            valores = [v for _, v in pontos]
+            v_min, v_max = min(valores), max(valores)
+            escala_y = (y_base - y_topo) / (v_max - v_min) if v_max > v_min else 0
+            escala_x = largura_util / max(1, len(buffer) - 1)
+
+            coords = []
+            for indice, valor in pontos:
+                coords.append(margem_esq + indice * escala_x)
+                coords.append(y_base - (valor - v_min) * escala_y if escala_y else (y_topo + y_base) / 2)
+            self.charts_canvas.create_line(coords, fill=CORES_GRAFICOS[i % len(CORES_GRAFICOS)], width=2, tags="grafico")
+
     def exibir_relatorio(self, initial_load=False):
-        """Atualiza a área de texto de relatórios na Aba 3."""
+        """
+        Atualiza a área de texto de relatórios na Aba 3.
+        O cálculo roda em segundo plano; os resultados chegam por _coletar_relatorios.
+        """
         self.report_text.config(state=tk.NORMAL)
         self.report_text.delete("1.0", tk.END)
+        self.report_text.tag_configure("mission_header", font=('Inter', 12, 'bold'), foreground='#42A5F5')
+
+        tipos = REGISTRO_MISSOES.tipos(self.drone.identificador)
+        self.report_type_combobox.config(values=[TODOS_OS_TIPOS] + tipos)
+        if self.report_type_combobox.get() not in tipos:
+            self.report_type_combobox.set(TODOS_OS_TIPOS)
 
-        atual = self.drone.missoes.inicio
-        if not atual:
+        missoes = self._missoes_do_relatorio()
+        if not missoes:
+            self.gerador_relatorios.cancelar()
+            self.report_progressbar['value'] = 0
+            self.report_status_label.config(text="")
             if not initial_load:
                 self.report_text.insert(tk.END, "Nenhum relatório disponível para este drone.")
             self.report_text.config(state=tk.DISABLED)
             return
 
-        # Insere todos os relatórios
-        i = 1
-        while atual:
-            # Chama gerar_relatorio(), que percorre a Lista Encadeada
-            relatorio = atual.dado.gerar_relatorio() 
-            self.report_text.insert(tk.END, f"\n--- Missão {i} ({atual.dado.tipo}) ---\n", "mission_header")
-            
-            for k, v in relatorio.items():
-                self.report_text.insert(tk.END, f"- {k}: {v}\n")
-            
-            atual = atual.proximo
-            i += 1
-        
-        self.report_text.tag_configure("mission_header", font=('Inter', 12, 'bold'), foreground='#42A5F5')
         self.report_text.config(state=tk.DISABLED)
+        self.report_progressbar['maximum'] = len(missoes)
+        self.report_progressbar['value'] = 0
+        self.report_status_label.config(text=f"Gerando 0/{len(missoes)}...")
+        self.gerador_relatorios.iniciar(missoes)
+        self._relatorio_em_andamento = True
+        self._agendar_coleta()
+
+    def _agendar_coleta(self):
+        if self._coleta_agendada is None:
+            self._coleta_agendada = self.root.after(INTERVALO_COLETA_MS, self._coletar_relatorios)
+
+    def _missoes_do_relatorio(self) -> list:
+        """Missões finalizadas do drone atual, filtradas pelo tipo e período escolhidos, via registro da frota."""
+        tipo = self.report_type_combobox.get()
+        if not tipo or tipo == TODOS_OS_TIPOS:
+            tipo = None
+        janela = PERIODOS_RELATORIO.get(self.report_period_combobox.get())
+        inicio = datetime.now() - janela if janela else None
+        return REGISTRO_MISSOES.consultar(self.drone.identificador, tipo=tipo, inicio=inicio, finalizadas=True)
+
+    def excluir_missao(self):
+        """Remove do histórico a missão de número 'Missão nº' da lista atual."""
+        missoes = self._missoes_do_relatorio()
+        try:
+            numero = int(self.range_mission_spinbox.get())
+        except ValueError:
+            messagebox.showwarning("Excluir Missão", "Informe o número da missão.")
+            return
+        if not 1 <= numero <= len(missoes):
+            messagebox.showwarning("Excluir Missão", f"Missão inexistente. A lista atual tem {len(missoes)} missão(ões) finalizada(s).")
+            return
+
+        missao = missoes[numero - 1]
+        if not messagebox.askyesno("Excluir Missão", f"Excluir a missão {numero} ({missao.tipo}, ID {missao.id})?"):
+            return
+        self.drone.remover_missao(missao)
+        self.exibir_relatorio()
+
+    def consultar_intervalo(self):
+        """Exibe as estatísticas do intervalo selecionado na Aba 3 (consulta O(log n))."""
+        missoes = self._missoes_do_relatorio()
+        try:
+            numero = int(self.range_mission_spinbox.get())
+            inicio = float(self.range_start_entry.get())
+            fim = float(self.range_end_entry.get())
+        except ValueError:
+            messagebox.showwarning("Intervalo", "Informe valores numéricos para a missão e o intervalo.")
+            return
+        if not 1 <= numero <= len(missoes):
+            messagebox.showwarning("Intervalo", f"Missão inexistente. A lista atual tem {len(missoes)} missão(ões) finalizada(s).")
+            return
+
+        missao = missoes[numero - 1]
+        if self.range_mode_combobox.get() == "Pontos":
+            resultado = missao.consultar_intervalo(int(inicio), int(fim))
+        else:
+            resultado = missao.consultar_periodo(inicio, fim)
+
+        texto = "\n".join(f"- {k}: {v}" for k, v in resultado.items())
+        messagebox.showinfo(f"Missão {numero} ({missao.tipo}) - Intervalo", texto)
+
+    def ao_fechar(self):
+        """Interrompe a thread de relatórios antes de destruir a janela."""
+        self.gerador_relatorios.encerrar()
+        self.root.destroy()
+
+    def cancelar_relatorios(self):
+        """Interrompe a geração de relatórios em andamento."""
+        self.gerador_relatorios.cancelar()
+
+    def _coletar_relatorios(self):
+        """Consome a fila da thread de relatórios sem bloquear o loop do Tkinter."""
+        self._coleta_agendada = None
+        tarefa_atual = self.gerador_relatorios.tarefa_atual()
+
+        for mensagem in self.gerador_relatorios.coletar():
+            tipo, tarefa = mensagem[0], mensagem[1]
+            if tipo == "arquivada":
+                _, _, missao, forma_fria = mensagem
+                if forma_fria is not None:
+                    missao.aplicar_arquivo(forma_fria) # Troca barata: a compactação já foi feita
+                continue
+            if tarefa != tarefa_atual:
+                continue # Resultado de uma tarefa já substituída (ex.: troca de drone)
+
+            if tipo == "progresso":
+                _, _, concluidos, total = mensagem
+                self.report_progressbar['value'] = concluidos
+                self.report_status_label.config(text=f"Gerando {int(concluidos)}/{total} ({concluidos / total:.0%})...")
+            elif tipo == "relatorio":
+                _, _, indice, missao, relatorio = mensagem
+                self.report_text.config(state=tk.NORMAL)
+                self.report_text.insert(tk.END, f"\n--- Missão {indice + 1} ({missao.tipo}, ID {missao.id}) ---\n", "mission_header")
+                for k, v in relatorio.items():
+                    self.report_text.insert(tk.END, f"- {k}: {v}\n")
+                self.report_text.config(state=tk.DISABLED)
+            elif tipo == "concluido":
+                cancelada = mensagem[2]
+                self.report_status_label.config(text="Cancelado." if cancelada else "Concluído.")
+                self._relatorio_em_andamento = False
+
+        if self._relatorio_em_andamento or self.gerador_relatorios.arquivamentos_pendentes():
+            self._agendar_coleta()
 
     def on_canvas_resize(self, event):
         """Redesenha o mapa quando o canvas é redimensionado."""
@@ -587,7 +1051,7 @@ class InterfaceDrone:
         details_frame.pack(expand=True, fill='both')
 
         ttk.Label(details_frame, text="Dados Ambientais:", font=('Inter', 14, 'bold'), background='#34495e', foreground='white').pack(pady=5, anchor="w")
-        env_data = self.environmental_map_data.get((col, row), {})
+        env_data = self.mapa.amostrar(col, row)
         
         # Lógica de exibição de dados ambientais
         for key, value in env_data.items():
@@ -597,14 +1061,23 @@ class InterfaceDrone:
             elif "areas_verdes" in key:
                 display_value = f"{value}%"
             elif "poluicao_ar" in key:
-                ponto_temp = PontoDeVoo(0,0,indice_poluicao_ar=value, **env_data)
-                display_value = f"{value} ({ponto_temp.categoria_poluicao()[0]})"
+                display_value = f"{value} ({CATEGORIAS_POLUICAO[indice_categoria_poluicao(value)][0]})"
             elif "ruido" in key:
                 display_value = f"{value} dB"
             else:
                 display_value = value
             ttk.Label(details_frame, text=f"- {display_key}: {display_value}", font=('Inter', 10), background='#34495e', foreground='#E0E0E0').pack(anchor="w", padx=10)
 
+        # Alertas lidos das máscaras pré-calculadas do mapa
+        indice = self.mapa.indice(col, row)
+        alertas = []
+        if self.mapa.mascara_risco[indice]:
+            alertas.append("Zona de risco")
+        if self.mapa.mascara_perda_gps[indice]:
+            alertas.append("Perda de sinal GPS")
+        if alertas:
+            ttk.Label(details_frame, text=f"⚠️ {' | '.join(alertas)}", font=('Inter', 10, 'bold'), background='#34495e', foreground='#FF7043').pack(anchor="w", padx=10, pady=(10, 0))
+
         close_button = ttk.Button(details_frame, text="Fechar", command=details_window.destroy)
         close_button.pack(pady=15)
         
@@ -614,7 +1087,8 @@ class InterfaceDrone:
         if selected_id in self.drones:
             self.drone_selecionado_id = selected_id
             self.drone = self.drones[selected_id]
-            self.x, self.y = LARGURA_MAPA // 2, ALTURA_MAPA // 2 
             self.desenhar_mapa()
             self.update_telemetry_display()
+            # Cancela os relatórios do drone anterior e gera os do novo
+            self.exibir_relatorio()
             messagebox.showinfo("Drone Selecionado", f"Drone '{selected_id}' selecionado com sucesso.")
\ No newline at end of file
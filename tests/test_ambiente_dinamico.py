@@ -0,0 +1,59 @@
+# tests/test_ambiente_dinamico.py
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+import core.ambiente_dinamico
+from core.ambiente_dinamico import AmbienteDinamico
+from core.mapa_ambiental import MapaAmbiental
+
+TICKS = 120
+
+
+@contextmanager
+def _sem_numpy():
+    """Força o caminho em Python puro nos dois módulos que testam 'np is None'."""
+    with mock.patch("core.ambiente_dinamico.np", None), mock.patch("core.mapa_ambiental.np", None):
+        yield
+
+
+def _simular(map_type, seed, ticks=TICKS, estado=None):
+    """Mapa novo e AmbienteDinamico com a mesma seed; retorna (mapa, ambiente, células mudadas por tick)."""
+    mapa = MapaAmbiental.gerar(map_type, seed, 23, 17)
+    ambiente = AmbienteDinamico(mapa, seed=seed)
+    if estado is not None:
+        ambiente.restaurar_estado(estado)
+    mudancas = [ambiente.passo() for _ in range(ticks)]
+    return mapa, ambiente, mudancas
+
+
+@unittest.skipIf(core.ambiente_dinamico.np is None, "NumPy não instalado")
+class TestNumpyEPythonPuro(unittest.TestCase):
+    """Os dois caminhos do estêncil devem produzir exatamente os mesmos dados e células mudadas."""
+    def test_mesmos_dados_e_mudancas(self):
+        for map_type in ("Urbano", "Rural", "Misto"):
+            with self.subTest(map_type=map_type):
+                mapa_np, ambiente_np, mudancas_np = _simular(map_type, 8)
+                with _sem_numpy():
+                    mapa_py, ambiente_py, mudancas_py = _simular(map_type, 8)
+                    self.assertIsInstance(mapa_py.poluicao, list)
+                    estado_py = ambiente_py.estado()
+                self.assertGreater(sum(map(len, mudancas_np)), 0) # O teste precisa de mudanças de categoria
+                self.assertEqual(mudancas_py, mudancas_np)
+                self.assertEqual(mapa_py.dados_atuais(), mapa_np.dados_atuais())
+                self.assertEqual(list(mapa_py.categorias), mapa_np.categorias.tolist())
+                self.assertEqual(estado_py, ambiente_np.estado())
+
+    def test_estado_entre_caminhos(self):
+        # Estado tirado com NumPy e retomado sem ele (ex.: snapshot aberto em outra máquina)
+        _, ambiente_np, _ = _simular("Urbano", 3, ticks=40)
+        estado = ambiente_np.estado()
+        mapa_np, _, mudancas_np = _simular("Urbano", 3, ticks=40, estado=estado)
+        with _sem_numpy():
+            mapa_py, _, mudancas_py = _simular("Urbano", 3, ticks=40, estado=estado)
+        self.assertEqual(mudancas_py, mudancas_np)
+        self.assertEqual(mapa_py.dados_atuais(), mapa_np.dados_atuais())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+# tests/test_analise_intervalo.py
+import math
+import random
+import unittest
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from core.analise_intervalo import (SomasPrefixadas, ArvoreSegmentosMinMax, ColunaEmBlocos, InstantesEmMs,
+                                    TAMANHO_BLOCO)
+from core.missao import Missao
+from core.ponto_voo import PontoDeVoo, calcular_distancia
+
+# Tamanhos nas bordas das duplicações da árvore e dos blocos da forma fria
+TAMANHOS = [1, 2, 3, 5, 8, 9, 63, 64, 65, 127, 128, 129, 200, 1025]
+
+
+def _intervalos(rng, n, quantidade=150):
+    """Intervalos [i, j] aleatórios mais os das pontas e de um único ponto."""
+    intervalos = [(0, n - 1), (0, 0), (n - 1, n - 1)]
+    for _ in range(quantidade):
+        i = rng.randrange(n)
+        intervalos.append((i, rng.randrange(i, n)))
+    return intervalos
+
+
+class TestEstruturas(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(31)
+
+    def test_somas_prefixadas(self):
+        for n in TAMANHOS:
+            valores = [self.rng.uniform(-50, 50) for _ in range(n)]
+            somas = SomasPrefixadas()
+            for valor in valores:
+                somas.adicionar(valor)
+            self.assertEqual(len(somas), n)
+            for i, j in _intervalos(self.rng, n):
+                self.assertAlmostEqual(somas.soma(i, j), sum(valores[i:j + 1]), places=7)
+
+    def test_arvore_a_cada_duplicacao(self):
+        # Consulta depois de cada inserção: cobre a árvore antes e depois de cada _crescer
+        valores = []
+        arvore = ArvoreSegmentosMinMax()
+        for _ in range(300):
+            valores.append(self.rng.randint(0, 500))
+            arvore.adicionar(valores[-1])
+            n = len(valores)
+            self.assertEqual(len(arvore), n)
+            for i, j in _intervalos(self.rng, n, quantidade=10):
+                trecho = valores[i:j + 1]
+                self.assertEqual(arvore.consultar(i, j), (min(trecho), max(trecho)))
+
+    def test_arvore_grande(self):
+        for n in TAMANHOS:
+            valores = [self.rng.uniform(0, 300) for _ in range(n)]
+            arvore = ArvoreSegmentosMinMax()
+            for valor in valores:
+                arvore.adicionar(valor)
+            for i, j in _intervalos(self.rng, n):
+                trecho = valores[i:j + 1]
+                self.assertEqual(arvore.consultar(i, j), (min(trecho), max(trecho)))
+
+    def test_coluna_em_blocos_inteiros(self):
+        for n in TAMANHOS + [3 * TAMANHO_BLOCO, 10 * TAMANHO_BLOCO + 1]:
+            valores = [self.rng.randint(-300, 900) for _ in range(n)]
+            coluna = ColunaEmBlocos.de_codigos(array("h", valores))
+            self.assertEqual(len(coluna), n)
+            for i, j in _intervalos(self.rng, n):
+                trecho = valores[i:j + 1]
+                self.assertEqual(coluna.soma(i, j), sum(trecho))
+                self.assertEqual(coluna.consultar(i, j), (min(trecho), max(trecho)))
+
+    def test_coluna_em_blocos_decodificada(self):
+        # Quadrados dos passos decodificados com sqrt: mesmas somas da SomasPrefixadas
+        for n in TAMANHOS:
+            quadrados = [self.rng.randint(0, 8) for _ in range(n)]
+            coluna = ColunaEmBlocos.de_codigos(array("b", quadrados), math.sqrt)
+            somas = SomasPrefixadas()
+            for quadrado in quadrados:
+                somas.adicionar(math.sqrt(quadrado))
+            for i, j in _intervalos(self.rng, n):
+                self.assertEqual(coluna.soma(i, j), somas.soma(i, j))
+                trecho = quadrados[i:j + 1]
+                self.assertEqual(coluna.consultar(i, j), (math.sqrt(min(trecho)), math.sqrt(max(trecho))))
+
+    def test_coluna_remontada_das_partes(self):
+        valores = [self.rng.randint(0, 300) for _ in range(500)]
+        coluna = ColunaEmBlocos.de_codigos(array("h", valores))
+        copia = ColunaEmBlocos(**coluna.partes())
+        for i, j in _intervalos(self.rng, len(valores)):
+            self.assertEqual(copia.soma(i, j), coluna.soma(i, j))
+            self.assertEqual(copia.consultar(i, j), coluna.consultar(i, j))
+
+    def test_instantes_em_ms(self):
+        milissegundos = sorted(self.rng.randint(0, 60_000) for _ in range(400))
+        instantes = InstantesEmMs(array("l", milissegundos))
+        segundos = [ms / 1000 for ms in milissegundos]
+        self.assertEqual(len(instantes), len(segundos))
+        self.assertEqual([instantes[k] for k in range(len(instantes))], segundos)
+        for _ in range(100):
+            t = self.rng.uniform(-1, 61)
+            self.assertEqual(bisect_left(instantes, t), bisect_left(segundos, t))
+            self.assertEqual(bisect_right(instantes, t), bisect_right(segundos, t))
+
+
+class TestConsultasDaMissao(unittest.TestCase):
+    """consultar_intervalo/consultar_periodo contra fatias da lista de pontos, quente e arquivada."""
+    def setUp(self):
+        self.rng = random.Random(7)
+        self.missao = Missao("Teste")
+        self.missao.data_inicio = datetime(2026, 1, 1, 12, 0, 0)
+        inicio = self.missao.data_inicio.timestamp()
+        x, y, bateria, ms = 5, 5, 100.0, 0
+        self.pontos = []
+        for _ in range(700):
+            x = max(0, x + self.rng.choice((-1, 0, 1)))
+            y = max(0, y + self.rng.choice((-1, 0, 1)))
+            bateria -= self.rng.choice((0, 0.25, 0.5)) # Múltiplos de 0,25: exatos em binário
+            ms += self.rng.randint(1, 900)
+            ponto = PontoDeVoo(x, y, bateria, indice_poluicao_ar=self.rng.randint(0, 400),
+                               densidade_populacional=self.rng.randint(0, 5000))
+            ponto.instante = inicio + ms / 1000
+            self.missao.adicionar_ponto(ponto)
+            self.pontos.append(ponto)
+        self.missao.finalizar_missao()
+
+    def _esperado(self, i, j):
+        trecho = self.pontos[i:j + 1]
+        distancia = sum(calcular_distancia(a.coordenadas, b.coordenadas) for a, b in zip(trecho, trecho[1:]))
+        poluicao = [p.indice_poluicao_ar for p in trecho]
+        return {
+            "Pontos Coletados": len(trecho),
+            "distancia": distancia,
+            "Bateria consumida (%)": round(trecho[0].nivel_bateria - trecho[-1].nivel_bateria, 2),
+            "Média Poluição (AQI)": round(sum(poluicao) / len(trecho), 2),
+            "Mínima Poluição (AQI)": min(poluicao),
+            "Máxima Poluição (AQI)": max(poluicao),
+            "Média densidade populacional": round(sum(p.densidade_populacional for p in trecho) / len(trecho), 2),
+        }
+
+    def _verificar(self, resultado, i, j):
+        esperado = self._esperado(i, j)
+        self.assertEqual(resultado["Intervalo (pontos)"], f"{i} a {j}")
+        self.assertAlmostEqual(float(resultado["Distância percorrida (unidades)"]), esperado.pop("distancia"),
+                               delta=0.006)
+        for chave, valor in esperado.items():
+            self.assertEqual(resultado[chave], valor, chave)
+
+    def _verificar_todos(self):
+        n = len(self.pontos)
+        for i, j in _intervalos(self.rng, n, quantidade=100):
+            self._verificar(self.missao.consultar_intervalo(i, j), i, j)
+        self.assertIn("Relatório", self.missao.consultar_intervalo(0, n))
+        self.assertIn("Relatório", self.missao.consultar_intervalo(5, 4))
+
+        inicio = self.missao.data_inicio.timestamp()
+        segundos = [p.instante - inicio for p in self.pontos]
+        for _ in range(100):
+            # Limites entre milissegundos: a forma fria guarda os instantes em ms
+            a = self.rng.randint(-1000, int(segundos[-1] * 1000)) + 0.5
+            b = a + self.rng.randint(0, 60_000)
+            a, b = a / 1000, b / 1000
+            dentro = [k for k, t in enumerate(segundos) if a <= t <= b]
+            resultado = self.missao.consultar_periodo(a, b)
+            if not dentro:
+                self.assertIn("Relatório", resultado)
+            else:
+                self._verificar(resultado, dentro[0], dentro[-1])
+
+    def test_quente(self):
+        self._verificar_todos()
+
+    def test_arquivada(self):
+        self.missao.arquivar()
+        self.assertTrue(self.missao.arquivada)
+        self._verificar_todos()
+        self.assertTrue(self.missao.arquivada) # As consultas não reidratam
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+# tests/test_arquivo_missao.py
+import random
+import unittest
+from datetime import datetime
+
+from core.arquivo_missao import (compactar_pontos, descompactar_pontos, AreaQuente, AREA_QUENTE, COMPRESSOES,
+                                 CAPACIDADE_AREA_QUENTE)
+from core.missao import Missao
+from core.ponto_voo import PontoDeVoo
+
+INICIO = datetime(2026, 3, 1, 9, 30, 0)
+
+
+def _pontos(rng, quantidade, inicio=INICIO.timestamp()):
+    """
+    Pontos de uma missão simulada. A bateria cai em passos de 0,25% e os
+    instantes caem em milissegundos inteiros desde o primeiro ponto: os dois
+    voltam exatos da quantização do arquivo. Os passos de 10 ms evitam
+    instantes em x,xx5 s, cuja formatação com 2 casas depende do último bit.
+    """
+    x, y, bateria, ms = 10, 10, 100.0, 0
+    pontos = []
+    for _ in range(quantidade):
+        ponto = PontoDeVoo(x, y, bateria,
+                           tipo_area=rng.choice(["urbana", "rural", "mata"]),
+                           densidade_populacional=rng.randint(0, 9000),
+                           presenca_areas_verdes=rng.randint(0, 100),
+                           indice_poluicao_ar=rng.randint(0, 500),
+                           presenca_construcoes_altas=rng.choice(["sim", "não"]),
+                           sinal_gps=rng.choice(["forte", "fraco", "perdido"]),
+                           intensidade_ruido=rng.randint(20, 110))
+        ponto.instante = inicio + ms / 1000
+        pontos.append(ponto)
+        x = max(0, x + rng.choice((-1, 0, 1)))
+        y = max(0, y + rng.choice((-1, 0, 1)))
+        bateria -= rng.choice((0, 0.25, 0.5, 1.25))
+        ms += 10 * rng.randint(1, 200)
+    return pontos
+
+
+def _missao(rng, quantidade):
+    missao = Missao("Teste")
+    missao.data_inicio = INICIO
+    for ponto in _pontos(rng, quantidade):
+        missao.adicionar_ponto(ponto)
+    missao.finalizar_missao()
+    return missao
+
+
+class TestCompactacao(unittest.TestCase):
+    def test_ida_e_volta(self):
+        pontos = _pontos(random.Random(1), 500)
+        for compressao in COMPRESSOES:
+            with self.subTest(compressao=compressao):
+                restaurados = descompactar_pontos(compactar_pontos(pontos, compressao))
+                self.assertEqual([vars(p) for p in restaurados], [vars(p) for p in pontos])
+
+    def test_ida_e_volta_vazia_e_unitaria(self):
+        for pontos in ([], _pontos(random.Random(2), 1)):
+            for compressao in COMPRESSOES:
+                with self.subTest(n=len(pontos), compressao=compressao):
+                    restaurados = descompactar_pontos(compactar_pontos(pontos, compressao))
+                    self.assertEqual([vars(p) for p in restaurados], [vars(p) for p in pontos])
+
+    def test_compressao_desconhecida(self):
+        with self.assertRaises(ValueError):
+            compactar_pontos(_pontos(random.Random(3), 5), "gzip")
+
+
+class TestAreaQuente(unittest.TestCase):
+    def test_despeja_a_menos_usada(self):
+        class MissaoFalsa:
+            def __init__(self):
+                self.rebaixada = False
+
+            def rebaixar(self):
+                self.rebaixada = True
+
+        area = AreaQuente(capacidade=2)
+        a, b, c = MissaoFalsa(), MissaoFalsa(), MissaoFalsa()
+        area.registrar(a)
+        area.registrar(b)
+        area.registrar(a) # 'a' volta a ser a mais recente
+        area.registrar(c)
+        self.assertEqual((a.rebaixada, b.rebaixada, c.rebaixada), (False, True, False))
+        self.assertEqual(len(area), 2)
+        area.descartar(a)
+        area.descartar(a) # Descartar duas vezes não é erro
+        self.assertEqual(len(area), 1)
+
+    def test_missoes_reidratadas(self):
+        rng = random.Random(4)
+        missoes = [_missao(rng, 30) for _ in range(CAPACIDADE_AREA_QUENTE + 1)]
+        for missao in missoes:
+            missao.arquivar()
+            self.assertTrue(missao.arquivada)
+        for missao in missoes:
+            missao.pontos_voo # Reidrata
+        # A primeira reidratada passou da capacidade e voltou à forma fria
+        self.assertTrue(missoes[0].arquivada)
+        self.assertFalse(any(m.arquivada for m in missoes[1:]))
+        self.assertEqual(len(AREA_QUENTE), CAPACIDADE_AREA_QUENTE)
+        missoes[1].pontos_voo # Uso recente: a próxima a sair é missoes[2]
+        missoes[0].pontos_voo
+        self.assertTrue(missoes[2].arquivada)
+        self.assertFalse(missoes[1].arquivada)
+        self.assertEqual(len(missoes[0].pontos_voo.to_list()), 30)
+
+
+class TestConsultasAposArquivar(unittest.TestCase):
+    def test_intervalos_e_periodos_iguais(self):
+        for compressao in COMPRESSOES:
+            with self.subTest(compressao=compressao):
+                rng = random.Random(5)
+                missao = _missao(rng, 1000)
+                n = len(missao.pontos_voo.to_list())
+                intervalos = [(0, n - 1), (0, 0), (n - 1, n - 1), (63, 64), (64, 127)]
+                for _ in range(200):
+                    i = rng.randrange(n)
+                    intervalos.append((i, rng.randrange(i, n)))
+                periodos = [(rng.uniform(-5, 1100), rng.uniform(0, 200)) for _ in range(100)]
+                periodos = [(inicio, inicio + duracao) for inicio, duracao in periodos]
+                antes = [missao.consultar_intervalo(i, j) for i, j in intervalos]
+                antes_periodo = [missao.consultar_periodo(a, b) for a, b in periodos]
+                relatorio = missao.gerar_relatorio()
+
+                missao.arquivar(compressao)
+                self.assertTrue(missao.arquivada)
+                self.assertEqual([missao.consultar_intervalo(i, j) for i, j in intervalos], antes)
+                self.assertEqual([missao.consultar_periodo(a, b) for a, b in periodos], antes_periodo)
+                self.assertEqual(missao.gerar_relatorio(), relatorio)
+                self.assertTrue(missao.arquivada) # Nada disso reidratou
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# tests/test_estimativa_bateria.py
+import random
+import unittest
+from unittest import mock
+
+import core.estimativa_bateria
+from core.estimativa_bateria import (estimar_autonomia, passos_necessarios, _percentil, PERCENTIS,
+                                     AMOSTRAS_SEM_NUMPY)
+
+np = core.estimativa_bateria.np
+
+
+def _sem_numpy(*args, **kwargs):
+    with mock.patch("core.estimativa_bateria.np", None):
+        return estimar_autonomia(*args, **kwargs)
+
+
+class TestPassosNecessarios(unittest.TestCase):
+    def test_rota_e_base(self):
+        self.assertEqual(passos_necessarios((2, 3)), 0)
+        self.assertEqual(passos_necessarios((2, 3), base=(2, 3)), 0)
+        self.assertEqual(passos_necessarios((2, 3), base=(0, 0)), 5)
+        rota = [(5, 3), (5, 7), (1, 7)]
+        self.assertEqual(passos_necessarios((2, 3), rota), 3 + 4 + 4)
+        # Volta à base a partir do último ponto da rota, não da origem
+        self.assertEqual(passos_necessarios((2, 3), rota, base=(0, 0)), 11 + 1 + 7)
+        self.assertEqual(passos_necessarios((2, 3), [], base=(0, 0)), 5)
+
+
+class TestEstimarAutonomia(unittest.TestCase):
+    def test_sem_bateria(self):
+        for bateria in (0, -1.5):
+            for estimar in (estimar_autonomia, _sem_numpy):
+                with self.subTest(bateria=bateria, estimar=estimar.__name__):
+                    na_base = estimar(bateria, (4, 4), base=(4, 4), seed=1)
+                    self.assertTrue(na_base["retorno_viavel"])
+                    self.assertEqual(na_base["probabilidade_retorno"], 1.0)
+                    fora = estimar(bateria, (4, 4), rota=[(6, 4)], base=(0, 0), seed=1)
+                    self.assertFalse(fora["retorno_viavel"])
+                    self.assertEqual(fora["probabilidade_retorno"], 0.0)
+                    self.assertEqual(fora["passos_necessarios"], 2 + 6 + 4)
+                    self.assertEqual(fora["passos"], {p: 0.0 for p in PERCENTIS})
+                    self.assertEqual(fora["distancia"], {p: 0.0 for p in PERCENTIS})
+                    self.assertEqual(fora["amostras"], 0)
+
+    def test_python_puro(self):
+        resultado = _sem_numpy(30, (0, 0), base=(2, 2), seed=4)
+        self.assertEqual(resultado["amostras"], AMOSTRAS_SEM_NUMPY)
+        self.assertEqual(resultado, _sem_numpy(30, (0, 0), base=(2, 2), seed=4)) # Mesma seed, mesmo resultado
+        passos = resultado["passos"]
+        self.assertTrue(passos[5] <= passos[50] <= passos[95])
+        # Consumo entre 0,5 e 2,0 por movimento: 15 a 60 movimentos (+1 do último) com 30%
+        self.assertTrue(15 <= passos[5] and passos[95] <= 61)
+        self.assertTrue(resultado["retorno_viavel"])
+
+    @unittest.skipIf(np is None, "NumPy não instalado")
+    def test_numpy_e_python_puro_concordam(self):
+        for bateria, necessarios in [(50, 7), (12.5, 3), (100, 80), (80, 64)]:
+            with self.subTest(bateria=bateria):
+                base = (necessarios, 0)
+                com = estimar_autonomia(bateria, (0, 0), base=base, n_amostras=2000, seed=9)
+                sem = _sem_numpy(bateria, (0, 0), base=base, n_amostras=2000, seed=9)
+                self.assertEqual(com["amostras"], sem["amostras"])
+                self.assertEqual(com["passos_necessarios"], sem["passos_necessarios"])
+                for p in PERCENTIS:
+                    # Geradores diferentes: só a distribuição precisa bater
+                    self.assertAlmostEqual(com["passos"][p], sem["passos"][p], delta=max(2.0, 0.05 * com["passos"][p]))
+                self.assertAlmostEqual(com["probabilidade_retorno"], sem["probabilidade_retorno"], delta=0.05)
+
+    @unittest.skipIf(np is None, "NumPy não instalado")
+    def test_percentil_igual_ao_numpy(self):
+        rng = random.Random(27)
+        for n in (1, 2, 3, 10, 101, 500):
+            valores = sorted(rng.randint(0, 100) for _ in range(n))
+            for p in PERCENTIS + (0, 100, 33.3):
+                self.assertAlmostEqual(_percentil(valores, p), float(np.percentile(valores, p)), places=9)
+
+
+if __name__ == "__main__":
+    unittest.main()
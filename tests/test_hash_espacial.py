@@ -0,0 +1,94 @@
+# tests/test_hash_espacial.py
+import math
+import random
+import unittest
+
+from core.hash_espacial import HashEspacial
+
+RAIOS = [0, 0.5, 1, 1.5, 2, 3.7, 4, 5, 9]
+TAMANHOS_BALDE = [1, 2, 3, 4, 7]
+
+
+def _pares_forca_bruta(posicoes: dict, raio: float) -> dict:
+    objetos = list(posicoes)
+    pares = {}
+    for k, a in enumerate(objetos):
+        for b in objetos[k + 1:]:
+            d = math.hypot(posicoes[a][0] - posicoes[b][0], posicoes[a][1] - posicoes[b][1])
+            if d <= raio:
+                pares[frozenset((a, b))] = d
+    return pares
+
+
+class TestHashEspacial(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(33)
+
+    def _frota(self, tamanho_balde, quantidade=60, lado=25):
+        """Hash e posições de uma frota aleatória (com células repetidas de propósito)."""
+        espaco = HashEspacial(tamanho_balde)
+        posicoes = {}
+        for k in range(quantidade):
+            posicoes[f"DRN{k:03d}"] = (self.rng.randrange(lado), self.rng.randrange(lado))
+        for objeto, (x, y) in posicoes.items():
+            espaco.inserir(objeto, x, y)
+        return espaco, posicoes
+
+    def _verificar(self, espaco, posicoes):
+        self.assertEqual(len(espaco), len(posicoes))
+        for raio in RAIOS:
+            pares = espaco.pares_proximos(raio)
+            encontrados = {frozenset((a, b)): d for a, b, d in pares}
+            self.assertEqual(len(encontrados), len(pares), "par repetido") # Nenhum par duas vezes
+            self.assertEqual(encontrados, _pares_forca_bruta(posicoes, raio))
+
+            for _ in range(20):
+                x, y = self.rng.randrange(-3, 28), self.rng.randrange(-3, 28)
+                esperado = {(o, math.hypot(ox - x, oy - y)) for o, (ox, oy) in posicoes.items()
+                            if math.hypot(ox - x, oy - y) <= raio}
+                vizinhos = espaco.vizinhos(x, y, raio)
+                self.assertEqual(len(set(vizinhos)), len(vizinhos))
+                self.assertEqual(set(vizinhos), esperado)
+
+        for x in range(-1, 26):
+            for y in range(-1, 26):
+                esperado = {o for o, posicao in posicoes.items() if posicao == (x, y)}
+                self.assertEqual(set(espaco.ocupantes(x, y)), esperado)
+
+    def test_contra_forca_bruta(self):
+        for tamanho in TAMANHOS_BALDE:
+            with self.subTest(tamanho_balde=tamanho):
+                self._verificar(*self._frota(tamanho))
+
+    def test_apos_mover_e_remover(self):
+        for tamanho in TAMANHOS_BALDE:
+            with self.subTest(tamanho_balde=tamanho):
+                espaco, posicoes = self._frota(tamanho)
+                for objeto in list(posicoes)[:30]:
+                    x, y = posicoes[objeto]
+                    # Passos curtos (mesmo balde) e saltos (outro balde)
+                    if self.rng.random() < 0.5:
+                        x, y = max(0, x + self.rng.choice((-1, 0, 1))), max(0, y + self.rng.choice((-1, 0, 1)))
+                    else:
+                        x, y = self.rng.randrange(25), self.rng.randrange(25)
+                    espaco.mover(objeto, x, y)
+                    posicoes[objeto] = (x, y)
+                    self.assertEqual(espaco.posicao(objeto), (x, y))
+                for objeto in list(posicoes)[::7]:
+                    espaco.remover(objeto)
+                    del posicoes[objeto]
+                    self.assertNotIn(objeto, espaco)
+                espaco.remover("inexistente") # Sem efeito
+                self._verificar(espaco, posicoes)
+
+    def test_reinserir_troca_posicao(self):
+        espaco = HashEspacial(4)
+        espaco.inserir("A", 1, 1)
+        espaco.inserir("A", 10, 10)
+        self.assertEqual(len(espaco), 1)
+        self.assertEqual(espaco.ocupantes(1, 1), [])
+        self.assertEqual(espaco.ocupantes(10, 10), ["A"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+# tests/test_registro_missoes.py
+import random
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from core.lista_encadeada import ListaEncadeada
+from core.missao import Missao
+from core.registro_missoes import RegistroMissoes
+
+DRONES = ["DRN001", "DRN002", "DRN003"]
+TIPOS = ["Entrega", "Inspeção", "Patrulha"]
+INICIO = datetime(2026, 5, 4, 8, 0, 0)
+
+
+class TestRegistroMissoes(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(36)
+        self.registro = RegistroMissoes(epoca=1000)
+        self.missoes = [] # (missao, drone) na ordem de registro
+        for k in range(60):
+            missao = Missao(rng.choice(TIPOS), self.registro.novo_id())
+            # Minutos repetidos de propósito: inícios iguais ficam na ordem de registro
+            missao.data_inicio = INICIO + timedelta(minutes=rng.randrange(40))
+            if rng.random() < 0.7:
+                missao.data_fim = missao.data_inicio + timedelta(minutes=5)
+            drone = rng.choice(DRONES)
+            self.registro.registrar(missao, drone)
+            self.missoes.append((missao, drone))
+
+    def _esperado(self, drone=None, tipo=None, inicio=None, fim=None, finalizadas=False):
+        """Filtro por força bruta, na ordem que consultar() promete."""
+        selecionadas = [(k, m) for k, (m, d) in enumerate(self.missoes)
+                        if (drone is None or d == drone) and (tipo is None or m.tipo == tipo)
+                        and (inicio is None or m.data_inicio >= inicio) and (fim is None or m.data_inicio <= fim)
+                        and (not finalizadas or m.data_fim is not None)]
+        if inicio is not None or fim is not None:
+            selecionadas.sort(key=lambda item: (item[1].data_inicio, item[0])) # Ordem de início
+        return [m for _, m in selecionadas]
+
+    def _verificar_consultas(self):
+        periodos = [(None, None), (INICIO + timedelta(minutes=10), None), (None, INICIO + timedelta(minutes=25)),
+                    (INICIO + timedelta(minutes=7), INICIO + timedelta(minutes=7)),
+                    (INICIO + timedelta(minutes=30), INICIO + timedelta(minutes=5))]
+        for drone in [None] + DRONES:
+            for tipo in [None] + TIPOS:
+                for inicio, fim in periodos:
+                    for finalizadas in (False, True):
+                        filtros = dict(drone=drone, tipo=tipo, inicio=inicio, fim=fim, finalizadas=finalizadas)
+                        with self.subTest(**filtros):
+                            self.assertEqual(
+                                self.registro.consultar(drone, tipo, inicio, fim, finalizadas),
+                                self._esperado(**filtros))
+        for drone in DRONES:
+            self.assertEqual(self.registro.do_drone(drone), self._esperado(drone=drone))
+            self.assertEqual(self.registro.tipos(drone), sorted({m.tipo for m in self._esperado(drone=drone)}))
+        for tipo in TIPOS:
+            self.assertEqual(self.registro.do_tipo(tipo), self._esperado(tipo=tipo))
+        self.assertEqual(self.registro.tipos(), sorted({m.tipo for m, _ in self.missoes}))
+        self.assertEqual(len(self.registro), len(self.missoes))
+
+    def test_novo_id_monotonico(self):
+        registro = RegistroMissoes(epoca=500)
+        self.assertEqual(registro.novo_id(), "500")
+        registro.reservar("900")
+        self.assertEqual(registro.novo_id(), "901")
+        registro.reservar("10") # Abaixo do próximo: não volta atrás
+        registro.reservar("missao-antiga") # Não numérico: ignorado
+        registro.reservar(None)
+        self.assertEqual(registro.novo_id(), "902")
+        missao = Missao("Entrega", "5000")
+        registro.registrar(missao, "DRN001") # Registrar também reserva
+        ids = [int(registro.novo_id()) for _ in range(50)]
+        self.assertEqual(ids, list(range(5001, 5051)))
+
+    def test_epoca_da_sessao(self):
+        antes = time.time_ns() // 1_000_000 * 1000
+        registro = RegistroMissoes()
+        depois = time.time_ns() // 1_000_000 * 1000
+        self.assertTrue(antes <= int(registro.novo_id()) <= depois)
+        # Uma sessão posterior começa depois de todos os IDs de ms desta (salvo > 1000 por ms)
+        time.sleep(0.002)
+        self.assertGreater(int(RegistroMissoes().novo_id()), int(registro.novo_id()))
+
+    def test_consultar_com_filtros(self):
+        self._verificar_consultas()
+
+    def test_no_periodo_limites(self):
+        minuto_7 = INICIO + timedelta(minutes=7)
+        no_minuto = [m for m, _ in self.missoes if m.data_inicio == minuto_7]
+        self.assertGreater(len(no_minuto), 1) # Os limites inclusivos precisam de inícios repetidos
+        self.assertEqual(self.registro.no_periodo(minuto_7, minuto_7), no_minuto)
+        self.assertEqual(self.registro.no_periodo(minuto_7 + timedelta(microseconds=1), minuto_7), [])
+        self.assertEqual(self.registro.no_periodo(minuto_7, minuto_7 - timedelta(microseconds=1)), [])
+        self.assertEqual(self.registro.no_periodo(INICIO - timedelta(days=1), INICIO - timedelta(seconds=1)), [])
+        self.assertEqual(len(self.registro.no_periodo()), len(self.missoes))
+        self.assertEqual(self.registro.no_periodo(fim=minuto_7), self._esperado(fim=minuto_7))
+        self.assertEqual(self.registro.no_periodo(inicio=minuto_7), self._esperado(inicio=minuto_7))
+
+    def test_remover_mantem_indices(self):
+        rng = random.Random(7)
+        for missao, drone in rng.sample(self.missoes, 25):
+            self.assertTrue(self.registro.remover(missao))
+            self.assertFalse(self.registro.remover(missao)) # Segunda vez: nada a remover
+            self.assertNotIn(missao.id, self.registro)
+            self.missoes.remove((missao, drone))
+        # Mesmo ID, outro objeto: não remove a missão registrada
+        missao, _ = self.missoes[0]
+        self.assertFalse(self.registro.remover(Missao(missao.tipo, missao.id)))
+        self._verificar_consultas()
+
+        self.registro.remover_drone("DRN002")
+        self.missoes = [(m, d) for m, d in self.missoes if d != "DRN002"]
+        self.assertEqual(self.registro.do_drone("DRN002"), [])
+        self._verificar_consultas()
+
+    def test_registrar_id_duplicado(self):
+        missao, drone = self.missoes[0]
+        self.registro.registrar(missao, drone) # A mesma missão de novo: sem efeito
+        self.assertEqual(len(self.registro), len(self.missoes))
+        with self.assertRaises(ValueError):
+            self.registro.registrar(Missao("Entrega", missao.id), drone)
+
+
+class TestListaEncadeadaIndexada(unittest.TestCase):
+    def test_rejeita_id_duplicado(self):
+        lista = ListaEncadeada(indexar_por_id=True)
+        a, b = Missao("Entrega", "1"), Missao("Entrega", "2")
+        lista.inserir_final(a)
+        lista.inserir_final(b)
+        with self.assertRaises(ValueError):
+            lista.inserir_final(Missao("Patrulha", "1"))
+        self.assertEqual(lista.tamanho(), 2)
+        self.assertIs(lista.buscar_por_id("1"), a)
+
+    def test_reindexar(self):
+        lista = ListaEncadeada(indexar_por_id=True)
+        a, b = Missao("Entrega", "1"), Missao("Entrega", "2")
+        lista.inserir_final(a)
+        lista.inserir_final(b)
+        a.id = "3"
+        lista.reindexar("1")
+        self.assertIs(lista.buscar_por_id("3"), a)
+        self.assertIsNone(lista.buscar_por_id("1"))
+        a.id = "2" # Colide com b: o índice continua apontando para cada um
+        with self.assertRaises(ValueError):
+            lista.reindexar("3")
+        self.assertIs(lista.buscar_por_id("3"), a)
+        self.assertIs(lista.buscar_por_id("2"), b)
+
+    def test_sem_indice_aceita_repetidos(self):
+        # Listas sem índice (ex.: históricos antigos) não verificam IDs
+        lista = ListaEncadeada()
+        lista.inserir_final(Missao("Entrega", "1"))
+        lista.inserir_final(Missao("Entrega", "1"))
+        self.assertEqual(lista.tamanho(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
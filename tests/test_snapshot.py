@@ -0,0 +1,238 @@
+# tests/test_snapshot.py
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from core.ambiente_dinamico import AmbienteDinamico
+from core.drone import Drone
+from core.lista_encadeada import ListaEncadeada
+from core.mapa_ambiental import MapaAmbiental
+from core.registro_missoes import REGISTRO_MISSOES
+import core.snapshot
+from core.snapshot import salvar_snapshot, carregar_snapshot, ErroSnapshot, _PREFIXO
+
+AMBIENTE = {
+    "tipo_area": "urbana",
+    "densidade_populacional": 420,
+    "presenca_areas_verdes": 12,
+    "indice_poluicao_ar": 130,
+    "presenca_construcoes_altas": True,
+    "sinal_gps": "forte",
+    "intensidade_ruido": 70,
+}
+
+
+def _voar(drone, tipo, passos, inicio=(0, 0)):
+    drone.iniciar_missao(tipo)
+    x, y = inicio
+    for i in range(passos):
+        drone.registrar_ponto_voo(x + i % 5, y + i // 5, dict(AMBIENTE, indice_poluicao_ar=40 + i * 7 % 300))
+        drone.bateria = 100 # Mantém a missão viva
+
+
+def _sessao():
+    """Um drone com missão arquivada, outra finalizada ainda quente e uma ativa; outro sem missões."""
+    a = Drone("DRN001", "Phantom Vision")
+    _voar(a, "Entrega", 40)
+    arquivada = a.missao_ativa
+    a.finalizar_missao()
+    arquivada.arquivar()
+    _voar(a, "Inspeção", 25, inicio=(3, 2))
+    a.finalizar_missao() # Finalizada, mas não arquivada
+    _voar(a, "Patrulha", 10, inicio=(6, 4))
+    b = Drone("DRN002", "Mavic Explorer")
+    b.x, b.y = 8, 5
+    return {
+        "drones": {"DRN001": a, "DRN002": b},
+        "drone_selecionado_id": "DRN001",
+        "map_type": "Urbano",
+        "environmental_map_data": {(0, 0): dict(AMBIENTE), (1, 0): dict(AMBIENTE, sinal_gps="perdido")},
+        "map_seeds": {"Urbano": 11, "Rural": 22, "Misto": 33},
+    }
+
+
+def _sem_indice(lista):
+    """Lista sem índice por id, para simular o histórico de um arquivo antigo com IDs repetidos."""
+    copia = ListaEncadeada()
+    for missao in lista.to_list():
+        copia.inserir_final(missao)
+    return copia
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.dir.name, "sessao.drnsnap")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _ida_e_volta(self, comprimir):
+        sessao = _sessao()
+        salvar_snapshot(self.caminho, sessao, comprimir=comprimir)
+        return sessao, carregar_snapshot(self.caminho)
+
+    def _verificar(self, original, restaurada):
+        self.assertEqual(restaurada["drone_selecionado_id"], original["drone_selecionado_id"])
+        self.assertEqual(restaurada["map_type"], original["map_type"])
+        self.assertEqual(restaurada["environmental_map_data"], original["environmental_map_data"])
+        self.assertEqual(restaurada["map_seeds"], original["map_seeds"])
+        self.assertEqual(set(restaurada["drones"]), set(original["drones"]))
+
+        for identificador, drone in original["drones"].items():
+            copia = restaurada["drones"][identificador]
+            self.assertEqual((copia.x, copia.y), (drone.x, drone.y))
+            self.assertEqual(copia.bateria, drone.bateria)
+            missoes = drone.missoes.to_list()
+            copias = copia.missoes.to_list()
+            self.assertEqual([m.id for m in copias], [m.id for m in missoes])
+            for missao, restaurada_missao in zip(missoes, copias):
+                self.assertEqual(restaurada_missao.tipo, missao.tipo)
+                self.assertEqual(restaurada_missao.data_inicio, missao.data_inicio)
+                self.assertEqual(restaurada_missao.arquivada, missao.arquivada)
+                self.assertEqual(restaurada_missao.gerar_relatorio(), missao.gerar_relatorio())
+                self.assertEqual(restaurada_missao.consultar_intervalo(0, 9)["Pontos Coletados"], 10)
+            if drone.missao_ativa is None:
+                self.assertIsNone(copia.missao_ativa)
+                continue
+            pontos = drone.missao_ativa.pontos_voo.to_list()
+            copias_pontos = copia.missao_ativa.pontos_voo.to_list()
+            self.assertEqual(len(copias_pontos), len(pontos))
+            for ponto, restaurado in zip(pontos, copias_pontos):
+                self.assertEqual(vars(restaurado), vars(ponto))
+
+    def test_ida_e_volta_sem_compressao(self):
+        self._verificar(*self._ida_e_volta(comprimir=False))
+
+    def test_ida_e_volta_comprimido(self):
+        self._verificar(*self._ida_e_volta(comprimir=True))
+
+    def test_indices_arquivados_sem_descompactar(self):
+        sessao = _sessao()
+        arquivada = sessao["drones"]["DRN001"].missoes.to_list()[0]
+        intervalos = [(0, 39), (3, 3), (5, 30), (0, 63)]
+        esperado = [arquivada.consultar_intervalo(i, j) for i, j in intervalos]
+        salvar_snapshot(self.caminho, sessao)
+        # Os índices vêm do próprio snapshot: a carga não pode decodificar o arquivo da missão
+        with mock.patch("core.missao.descompactar_colunas", side_effect=AssertionError("arquivo decodificado")):
+            restaurada = carregar_snapshot(self.caminho)
+            copia = restaurada["drones"]["DRN001"].missoes.to_list()[0]
+            self.assertTrue(copia.arquivada)
+            self.assertEqual([copia.consultar_intervalo(i, j) for i, j in intervalos], esperado)
+            self.assertEqual(copia.consultar_periodo(0, 3600), arquivada.consultar_periodo(0, 3600))
+
+    def test_arquivada_sem_indices_formato_anterior(self):
+        original = core.snapshot._missao_para_estado
+
+        def sem_indices(missao):
+            estado = original(missao)
+            estado.pop("indices", None)
+            return estado
+
+        sessao = _sessao()
+        with mock.patch("core.snapshot._missao_para_estado", side_effect=sem_indices):
+            salvar_snapshot(self.caminho, sessao)
+        self._verificar(sessao, carregar_snapshot(self.caminho))
+
+    def test_ambiente_continua_igual(self):
+        mapa = MapaAmbiental.gerar("Urbano", 11, 17, 10)
+        ambiente = AmbienteDinamico(mapa, seed=5)
+        for _ in range(30):
+            ambiente.passo()
+        sessao = dict(_sessao(), environmental_map_data=mapa.dados_atuais(),
+                      poluicao_base=mapa.poluicao_base, estado_ambiente=ambiente.estado())
+        salvar_snapshot(self.caminho, sessao)
+        restaurada = carregar_snapshot(self.caminho)
+
+        copia_mapa = MapaAmbiental("Urbano", 17, 10, restaurada["environmental_map_data"], seed=11,
+                                   poluicao_base=restaurada["poluicao_base"])
+        copia = AmbienteDinamico(copia_mapa)
+        copia.restaurar_estado(restaurada["estado_ambiente"])
+        self.assertEqual(copia_mapa.poluicao_base, mapa.poluicao_base)
+        for _ in range(30):
+            ambiente.passo()
+            copia.passo()
+        self.assertEqual(copia.tempo, ambiente.tempo)
+        self.assertEqual(copia.direcao_vento, ambiente.direcao_vento)
+        self.assertEqual(copia_mapa.dados_atuais(), mapa.dados_atuais())
+
+    def test_ids_legados_repetidos(self):
+        # Arquivos antigos usavam IDs do relógio: missões no mesmo instante repetiam o ID
+        sessao = _sessao()
+        a, b = sessao["drones"]["DRN001"], sessao["drones"]["DRN002"]
+        _voar(b, "Entrega", 5)
+        b.finalizar_missao()
+        for missao in a.missoes.to_list() + [a.missao_ativa] + b.missoes.to_list():
+            missao.id = "1700000000000"
+        a.missoes = _sem_indice(a.missoes)
+        salvar_snapshot(self.caminho, sessao)
+
+        restaurada = carregar_snapshot(self.caminho)
+        missoes = []
+        for drone in restaurada["drones"].values():
+            missoes += drone.missoes.to_list() + ([drone.missao_ativa] if drone.missao_ativa else [])
+        ids = [m.id for m in missoes]
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(ids.count("1700000000000"), 1)
+        REGISTRO_MISSOES.reconstruir(restaurada["drones"].values())
+        for drone in restaurada["drones"].values():
+            for missao in drone.missoes.to_list():
+                self.assertIs(drone.missoes.buscar_por_id(missao.id), missao)
+
+    def test_reconstruir_renumera_colisoes(self):
+        sessao = _sessao()
+        a, b = sessao["drones"]["DRN001"], sessao["drones"]["DRN002"]
+        _voar(b, "Entrega", 5)
+        b.finalizar_missao()
+        repetida = b.missoes.to_list()[0]
+        id_antigo = repetida.id
+        repetida.id = a.missoes.to_list()[0].id
+        b.missoes.reindexar(id_antigo)
+
+        REGISTRO_MISSOES.reconstruir(sessao["drones"].values())
+        self.assertNotEqual(repetida.id, a.missoes.to_list()[0].id)
+        self.assertIs(b.missoes.buscar_por_id(repetida.id), repetida)
+        self.assertEqual(REGISTRO_MISSOES.consultar("DRN002", finalizadas=True), [repetida])
+
+    def test_arquivo_vazio(self):
+        open(self.caminho, "wb").close()
+        with self.assertRaises(ErroSnapshot):
+            carregar_snapshot(self.caminho)
+
+    def test_magico_invalido(self):
+        with open(self.caminho, "wb") as arquivo:
+            arquivo.write(b"NAOSNAP!" + bytes(64))
+        with self.assertRaises(ErroSnapshot):
+            carregar_snapshot(self.caminho)
+
+    def test_arquivos_corrompidos(self):
+        # Sem compressão só o cabeçalho é verificável (bytes de colunas numéricas são aceitos como estão)
+        for comprimir in (False, True):
+            salvar_snapshot(self.caminho, _sessao(), comprimir=comprimir)
+            with open(self.caminho, "rb") as arquivo:
+                original = arquivo.read()
+            posicoes = [_PREFIXO.size + 3]
+            if comprimir:
+                posicoes += [len(original) // 2, len(original) - 40]
+            for posicao in posicoes:
+                corrompido = bytearray(original)
+                for k in range(posicao, posicao + 16):
+                    corrompido[k] ^= 0xA5
+                with open(self.caminho, "wb") as arquivo:
+                    arquivo.write(corrompido)
+                with self.subTest(comprimir=comprimir, posicao=posicao), self.assertRaises(ErroSnapshot):
+                    carregar_snapshot(self.caminho)
+
+    def test_truncado(self):
+        salvar_snapshot(self.caminho, _sessao())
+        with open(self.caminho, "rb") as arquivo:
+            dados = arquivo.read()
+        with open(self.caminho, "wb") as arquivo:
+            arquivo.write(dados[:len(dados) // 2])
+        with self.assertRaises(ErroSnapshot):
+            carregar_snapshot(self.caminho)
+
+
+if __name__ == "__main__":
+    unittest.main()
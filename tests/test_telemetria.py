@@ -0,0 +1,71 @@
+# tests/test_telemetria.py
+import random
+import unittest
+
+from core.telemetria import BufferCircular, reduzir_min_max
+
+
+class TestBufferCircular(unittest.TestCase):
+    def test_ordem_ao_dar_a_volta(self):
+        for capacidade in (1, 2, 5, 8):
+            buffer = BufferCircular(capacidade)
+            self.assertEqual(buffer.valores(), [])
+            self.assertIsNone(buffer.ultimo())
+            inseridos = []
+            for k in range(3 * capacidade + 2):
+                buffer.inserir(float(k))
+                inseridos.append(float(k))
+                with self.subTest(capacidade=capacidade, inseridos=k + 1):
+                    self.assertEqual(buffer.valores(), inseridos[-capacidade:])
+                    self.assertEqual(len(buffer), min(k + 1, capacidade))
+                    self.assertEqual(buffer.ultimo(), float(k))
+                    self.assertEqual(buffer.total_inserido, k + 1)
+
+    def test_capacidade_invalida(self):
+        for capacidade in (0, -3):
+            with self.assertRaises(ValueError):
+                BufferCircular(capacidade)
+
+
+class TestReduzirMinMax(unittest.TestCase):
+    def test_serie_curta_inteira(self):
+        valores = [3.0, 1.0, 4.0, 1.0, 5.0]
+        self.assertEqual(reduzir_min_max(valores, 3), list(enumerate(valores)))
+        self.assertEqual(reduzir_min_max(valores, 0), [])
+        self.assertEqual(reduzir_min_max([], 10), [])
+
+    def test_limite_e_extremos_por_balde(self):
+        rng = random.Random(26)
+        for n, largura in [(11, 5), (100, 7), (1000, 300), (4096, 640), (5000, 1), (777, 388)]:
+            # Valores repetidos de propósito: empates entre mínimo e máximo
+            valores = [float(rng.randint(0, 40)) for _ in range(n)]
+            with self.subTest(n=n, largura=largura):
+                pontos = reduzir_min_max(valores, largura)
+                self.assertLessEqual(len(pontos), 2 * largura)
+                indices = [i for i, _ in pontos]
+                self.assertEqual(indices, sorted(set(indices))) # Ordem temporal, sem repetir pontos
+                for i, valor in pontos:
+                    self.assertEqual(valores[i], valor)
+
+                tamanho_balde = n / largura
+                for b in range(largura):
+                    ini, fim = int(b * tamanho_balde), min(n, int((b + 1) * tamanho_balde))
+                    if ini >= fim:
+                        continue
+                    balde = valores[ini:fim]
+                    no_balde = [v for i, v in pontos if ini <= i < fim]
+                    self.assertIn(min(balde), no_balde)
+                    self.assertIn(max(balde), no_balde)
+                    self.assertLessEqual(len(no_balde), 2)
+
+    def test_pico_isolado_preservado(self):
+        valores = [0.0] * 10_000
+        valores[6789] = 99.0
+        valores[1234] = -5.0
+        pontos = reduzir_min_max(valores, 50)
+        self.assertIn((6789, 99.0), pontos)
+        self.assertIn((1234, -5.0), pontos)
+
+
+if __name__ == "__main__":
+    unittest.main()